@@ -1,8 +1,14 @@
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+import os
+import sys
 import pandas as pd
 
+# db_engine.py lives with the scraper; the Docker image copies it next to this file
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scraper'))
+from db_engine import get_engine, pool_stats
+
 app = Flask(__name__)
 CORS(app, resources={
     r"/*": {
@@ -13,18 +19,8 @@ CORS(app, resources={
     }
 })
 
-# Database configuration
-db_config = {
-    'user': 'postgres',
-    'password': 'postgres',
-    'host': 'db',  # This matches the service name in docker-compose
-    'port': '5432',
-    'database': 'premier_league'
-}
-
-# Create database connection
-db_url = f"postgresql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['database']}"
-engine = create_engine(db_url)
+# Shared pooled engine, configured from the POSTGRES_* environment variables
+engine = get_engine()
 
 @app.route('/teams', methods=['GET'])
 def get_teams():
@@ -41,6 +37,7 @@ def get_matches():
         # Get query parameters
         limit = request.args.get('limit', 3000, type=int)
         team = request.args.get('team')
+        season = request.args.get('season', type=int)  # Starting year, e.g. 2023 for 2023-24
         
         query = """
             SELECT 
@@ -67,12 +64,22 @@ def get_matches():
             JOIN teams at ON m.opponent_id = at.team_id
         """
         
+        # The team id is looked up first so the planner can use the
+        # (team_id, date_of_match DESC) index; a season prunes partitions
+        params = {'limit': limit}
+        conditions = []
         if team:
-            query += f" WHERE ht.team_name = '{team}'"
+            conditions.append("m.team_id = (SELECT team_id FROM teams WHERE team_name = :team)")
+            params['team'] = team
+        if season:
+            conditions.append("m.season = :season")
+            params['season'] = season
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
             
         query += " ORDER BY m.date_of_match DESC LIMIT :limit"
         
-        df = pd.read_sql(text(query), engine, params={'limit': limit})
+        df = pd.read_sql(text(query), engine, params=params)
         return jsonify(df.to_dict(orient='records'))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -104,5 +111,9 @@ def get_team_stats():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/pool_stats', methods=['GET'])
+def get_pool_stats():
+    return jsonify(pool_stats(engine))
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
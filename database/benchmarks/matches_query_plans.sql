@@ -0,0 +1,66 @@
+-- EXPLAIN ANALYZE of the API and feature-refresh queries on a synthetic
+-- 50-season history (10 leagues of 20 teams, double round robins), against
+-- the partitioned, indexed matches table and a copy in the old layout
+-- (plain table, primary key and match key only). Run on a scratch database
+-- with init.sql applied; it replaces the contents of teams and matches:
+--
+--     psql -d scratch -f database/init.sql
+--     psql -d scratch -f database/benchmarks/matches_query_plans.sql
+
+\set ON_ERROR_STOP on
+\timing off
+
+TRUNCATE matches, teams RESTART IDENTITY;
+
+INSERT INTO teams (team_name)
+SELECT format('League %s Team %s', to_char(league, 'FM00'), to_char(team, 'FM00'))
+FROM generate_series(1, 10) league, generate_series(1, 20) team;
+
+SELECT COUNT(*) AS partitions FROM (SELECT create_season_partition(season) FROM generate_series(1975, 2024) season) created;
+
+-- Every ordered pair meets once at home per season; the first half of the
+-- season holds the pairs with the lower id at home
+WITH fixtures AS (
+    SELECT season, home.team_id AS home_id, away.team_id AS away_id,
+           make_date(season, 8, 10) + 7 * ((home.team_id + away.team_id) % 19
+               + CASE WHEN home.team_id < away.team_id THEN 0 ELSE 19 END) AS match_date,
+           floor(random() * 5)::INTEGER AS home_goals, floor(random() * 5)::INTEGER AS away_goals,
+           round((random() * 3)::NUMERIC, 1)::FLOAT AS home_xg, round((random() * 3)::NUMERIC, 1)::FLOAT AS away_xg
+    FROM generate_series(1975, 2024) season
+    JOIN teams home ON TRUE
+    JOIN teams away ON (home.team_id - 1) / 20 = (away.team_id - 1) / 20 AND home.team_id <> away.team_id
+),
+sides AS (
+    SELECT season, match_date, home_id AS team_id, away_id AS opponent_id, home_xg AS xg, away_xg AS xga,
+           home_goals AS goals, away_goals AS opponent_goals, 'home' AS location_of_match FROM fixtures
+    UNION ALL
+    SELECT season, match_date, away_id, home_id, away_xg, home_xg, away_goals, home_goals, 'away' FROM fixtures
+)
+INSERT INTO matches (season, date_of_match, team_id, opponent_id, xg, xga, goals, opponent_goals,
+                     status_of_match, result, location_of_match, form_rolling_5)
+SELECT season, match_date, team_id, opponent_id, xg, xga, goals, opponent_goals,
+       CASE WHEN season = 2024 AND match_date > make_date(2024, 12, 1) THEN 'no' ELSE 'yes' END,
+       CASE WHEN goals > opponent_goals THEN 3 WHEN goals = opponent_goals THEN 1 ELSE 0 END,
+       location_of_match, random() * 3
+FROM sides;
+
+DROP TABLE IF EXISTS matches_flat;
+CREATE TABLE matches_flat (LIKE matches);
+INSERT INTO matches_flat SELECT * FROM matches;
+ALTER TABLE matches_flat ADD PRIMARY KEY (match_id);
+ALTER TABLE matches_flat ADD UNIQUE (date_of_match, team_id, opponent_id);
+
+VACUUM ANALYZE teams;
+VACUUM ANALYZE matches;
+VACUUM ANALYZE matches_flat;
+
+SELECT COUNT(*) AS matches, COUNT(DISTINCT season) AS seasons FROM matches;
+
+\set team '''League 03 Team 07'''
+
+\set tbl matches_flat
+\ir matches_query_plans_queries.sql
+\set tbl matches
+\ir matches_query_plans_queries.sql
+
+DROP TABLE matches_flat;
@@ -0,0 +1,37 @@
+-- Queries timed by matches_query_plans.sql against the table in :tbl
+
+\echo
+\echo '---- ' :tbl ': latest matches of one team (API /matches?team=) ----'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT m.date_of_match, ht.team_name AS team, at.team_name AS opponent, m.goals, m.opponent_goals
+FROM :tbl m
+JOIN teams ht ON m.team_id = ht.team_id
+JOIN teams at ON m.opponent_id = at.team_id
+WHERE m.team_id = (SELECT team_id FROM teams WHERE team_name = :team)
+ORDER BY m.date_of_match DESC
+LIMIT 50;
+
+\echo '---- ' :tbl ': one team in one season (API /matches?team=&season=) ----'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT m.date_of_match, ht.team_name AS team, m.goals, m.opponent_goals
+FROM :tbl m
+JOIN teams ht ON m.team_id = ht.team_id
+WHERE m.team_id = (SELECT team_id FROM teams WHERE team_name = :team) AND m.season = 2020
+ORDER BY m.date_of_match DESC;
+
+\echo '---- ' :tbl ': per-team aggregate (API /team_stats) ----'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT t.team_name, COUNT(*) AS matches_played, AVG(m.goals) AS avg_goals_scored,
+       AVG(m.opponent_goals) AS avg_goals_conceded, AVG(m.xg) AS avg_xg, AVG(m.xga) AS avg_xga,
+       AVG(m.form_rolling_5) AS recent_form
+FROM :tbl m
+JOIN teams t ON m.team_id = t.team_id
+WHERE t.team_name = :team
+GROUP BY t.team_name;
+
+\echo '---- ' :tbl ': played history of one team, in window order (refresh_match_features) ----'
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT match_id, date_of_match, result
+FROM :tbl
+WHERE team_id = 47 AND status_of_match = 'yes'
+ORDER BY date_of_match, match_id;
@@ -125,14 +125,24 @@
 
 DROP TABLE IF EXISTS matches;
 DROP TABLE IF EXISTS teams;
+DROP TABLE IF EXISTS team_feature_state;
 
 CREATE TABLE IF NOT EXISTS teams (
     team_id SERIAL PRIMARY KEY,
     team_name VARCHAR(100) UNIQUE NOT NULL
 );
 
+-- Season a match belongs to, as the year it starts in (August to July)
+CREATE OR REPLACE FUNCTION season_of(match_date TIMESTAMP) RETURNS INTEGER
+LANGUAGE SQL IMMUTABLE
+AS $$
+    SELECT EXTRACT(YEAR FROM match_date - INTERVAL '7 months')::INTEGER;
+$$;
+
+-- matches is range-partitioned by season, one partition per season
 CREATE TABLE IF NOT EXISTS matches (
-    match_id SERIAL PRIMARY KEY,
+    match_id SERIAL,
+    season INTEGER NOT NULL,  -- season_of(date_of_match)
     date_of_match TIMESTAMP NOT NULL,
     team_id INTEGER REFERENCES teams(team_id),
     opponent_id INTEGER REFERENCES teams(team_id),
@@ -151,5 +161,109 @@ CREATE TABLE IF NOT EXISTS matches (
     form_rolling_10 FLOAT,
     opponent_form_rolling_3 FLOAT,
     opponent_form_rolling_6 FLOAT,
-    UNIQUE (date_of_match, team_id, opponent_id)
-);
\ No newline at end of file
+    h2h_form_rolling_2 FLOAT,
+    h2h_venue_form_rolling_2 FLOAT,
+    venue_form_rolling_5 FLOAT,
+    row_hash BIGINT,  -- Client-side content hash; unchanged rows are never rewritten
+    PRIMARY KEY (match_id, season),
+    UNIQUE (date_of_match, team_id, opponent_id, season)
+) PARTITION BY RANGE (season);
+
+-- Creates the partition for one season unless it exists; loads call it for
+-- every season they touch, so rows never lack a partition
+CREATE OR REPLACE FUNCTION create_season_partition(season_start INTEGER) RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF to_regclass('matches_' || season_start) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF matches FOR VALUES FROM (%s) TO (%s)',
+                       'matches_' || season_start, season_start, season_start + 1);
+    END IF;
+END;
+$$;
+
+-- Latest matches of a team (API /matches?team=)
+CREATE INDEX IF NOT EXISTS matches_team_date_idx ON matches (team_id, date_of_match DESC);
+
+-- Per-team aggregates (API /team_stats), answered from the index alone
+CREATE INDEX IF NOT EXISTS matches_team_stats_idx ON matches (team_id)
+    INCLUDE (goals, opponent_goals, xg, xga, form_rolling_5);
+
+-- Played-match history read by refresh_match_features, in window order
+CREATE INDEX IF NOT EXISTS matches_played_idx ON matches (team_id, date_of_match, match_id)
+    WHERE status_of_match = 'yes';
+
+-- Snapshot of each team's recent values, so features for new results can
+-- be computed without replaying history
+CREATE TABLE IF NOT EXISTS team_feature_state (
+    team_name VARCHAR(100) PRIMARY KEY,
+    state JSONB NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- In-database feature mode: recomputes the feature columns of matches on or
+-- after `since` (every match when NULL) with window functions. Each window
+-- averages the previous n played matches in its partition, excluding the
+-- current one, like the Python feature engine.
+CREATE OR REPLACE PROCEDURE refresh_match_features(since TIMESTAMP DEFAULT NULL)
+LANGUAGE SQL
+AS $$
+    WITH affected AS (
+        SELECT DISTINCT team_id
+        FROM matches
+        WHERE since IS NULL OR (season >= season_of(since) AND date_of_match >= since)
+    ),
+    history AS (
+        SELECT m.match_id, m.season, m.date_of_match, m.team_id, m.opponent_id, m.location_of_match,
+               m.xg, m.xga, m.result,
+               m.xg - m.goals AS xg_diff,
+               m.xga - m.opponent_goals AS xga_diff
+        FROM matches m
+        JOIN affected a ON a.team_id = m.team_id
+        WHERE m.status_of_match = 'yes'
+    ),
+    features AS (
+        SELECT match_id, season, date_of_match,
+            AVG(xg) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS rolling_xg,
+            AVG(xga) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS rolling_xga,
+            AVG(xg_diff) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS rolling_xg_diff,
+            AVG(xga_diff) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS rolling_xga_diff,
+            AVG(result) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS form_rolling_5,
+            AVG(result) OVER (team_matches ROWS BETWEEN 10 PRECEDING AND 1 PRECEDING) AS form_rolling_10,
+            AVG(result) OVER (team_matches ROWS BETWEEN 3 PRECEDING AND 1 PRECEDING) AS opponent_form_rolling_3,
+            AVG(result) OVER (team_matches ROWS BETWEEN 6 PRECEDING AND 1 PRECEDING) AS opponent_form_rolling_6,
+            AVG(result) OVER (pair_matches ROWS BETWEEN 2 PRECEDING AND 1 PRECEDING) AS h2h_form_rolling_2,
+            AVG(result) OVER (pair_venue_matches ROWS BETWEEN 2 PRECEDING AND 1 PRECEDING) AS h2h_venue_form_rolling_2,
+            AVG(result) OVER (venue_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS venue_form_rolling_5
+        FROM history
+        WINDOW
+            team_matches AS (PARTITION BY team_id ORDER BY date_of_match, match_id),
+            pair_matches AS (PARTITION BY team_id, opponent_id ORDER BY date_of_match, match_id),
+            pair_venue_matches AS (PARTITION BY team_id, opponent_id, location_of_match ORDER BY date_of_match, match_id),
+            venue_matches AS (PARTITION BY team_id, location_of_match ORDER BY date_of_match, match_id)
+    )
+    UPDATE matches m
+    SET rolling_xg = f.rolling_xg,
+        rolling_xga = f.rolling_xga,
+        rolling_xg_diff = f.rolling_xg_diff,
+        rolling_xga_diff = f.rolling_xga_diff,
+        form_rolling_5 = f.form_rolling_5,
+        form_rolling_10 = f.form_rolling_10,
+        opponent_form_rolling_3 = f.opponent_form_rolling_3,
+        opponent_form_rolling_6 = f.opponent_form_rolling_6,
+        h2h_form_rolling_2 = f.h2h_form_rolling_2,
+        h2h_venue_form_rolling_2 = f.h2h_venue_form_rolling_2,
+        venue_form_rolling_5 = f.venue_form_rolling_5
+    FROM features f
+    WHERE m.match_id = f.match_id
+      AND m.season = f.season
+      AND (since IS NULL OR f.date_of_match >= since)
+      -- Skip rows whose features didn't change, leaving no dead tuples
+      AND (m.rolling_xg, m.rolling_xga, m.rolling_xg_diff, m.rolling_xga_diff,
+           m.form_rolling_5, m.form_rolling_10, m.opponent_form_rolling_3, m.opponent_form_rolling_6,
+           m.h2h_form_rolling_2, m.h2h_venue_form_rolling_2, m.venue_form_rolling_5)
+          IS DISTINCT FROM
+          (f.rolling_xg, f.rolling_xga, f.rolling_xg_diff, f.rolling_xga_diff,
+           f.form_rolling_5, f.form_rolling_10, f.opponent_form_rolling_3, f.opponent_form_rolling_6,
+           f.h2h_form_rolling_2, f.h2h_venue_form_rolling_2, f.venue_form_rolling_5);
+$$;
@@ -0,0 +1,161 @@
+-- Upgrades a matches table created by an earlier init.sql to the season
+-- partitioned layout with the query indexes. Existing rows keep their
+-- match_id. Run once, e.g.:
+--
+--     psql -U postgres -d premier_league -f database/migrations/001_partition_matches_by_season.sql
+--
+-- Fresh databases get this layout from init.sql directly.
+
+BEGIN;
+
+-- Columns added since the first schema, so every older table copies over
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS h2h_form_rolling_2 FLOAT;
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS h2h_venue_form_rolling_2 FLOAT;
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS venue_form_rolling_5 FLOAT;
+ALTER TABLE matches ADD COLUMN IF NOT EXISTS row_hash BIGINT;
+
+CREATE OR REPLACE FUNCTION season_of(match_date TIMESTAMP) RETURNS INTEGER
+LANGUAGE SQL IMMUTABLE
+AS $$
+    SELECT EXTRACT(YEAR FROM match_date - INTERVAL '7 months')::INTEGER;
+$$;
+
+-- Keep the old table (and its index names) out of the way until the copy is done
+ALTER TABLE matches RENAME TO matches_unpartitioned;
+ALTER INDEX matches_pkey RENAME TO matches_unpartitioned_pkey;
+
+CREATE TABLE matches (
+    match_id INTEGER NOT NULL DEFAULT nextval('matches_match_id_seq'),
+    season INTEGER NOT NULL,  -- season_of(date_of_match)
+    date_of_match TIMESTAMP NOT NULL,
+    team_id INTEGER REFERENCES teams(team_id),
+    opponent_id INTEGER REFERENCES teams(team_id),
+    xg FLOAT,
+    xga FLOAT,
+    goals INTEGER,
+    opponent_goals INTEGER,
+    status_of_match VARCHAR(20),
+    result INTEGER,
+    location_of_match VARCHAR(4),
+    rolling_xg FLOAT,
+    rolling_xga FLOAT,
+    rolling_xg_diff FLOAT,
+    rolling_xga_diff FLOAT,
+    form_rolling_5 FLOAT,
+    form_rolling_10 FLOAT,
+    opponent_form_rolling_3 FLOAT,
+    opponent_form_rolling_6 FLOAT,
+    h2h_form_rolling_2 FLOAT,
+    h2h_venue_form_rolling_2 FLOAT,
+    venue_form_rolling_5 FLOAT,
+    row_hash BIGINT,
+    PRIMARY KEY (match_id, season),
+    UNIQUE (date_of_match, team_id, opponent_id, season)
+) PARTITION BY RANGE (season);
+
+CREATE OR REPLACE FUNCTION create_season_partition(season_start INTEGER) RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF to_regclass('matches_' || season_start) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF matches FOR VALUES FROM (%s) TO (%s)',
+                       'matches_' || season_start, season_start, season_start + 1);
+    END IF;
+END;
+$$;
+
+SELECT create_season_partition(season)
+FROM (SELECT DISTINCT season_of(date_of_match) AS season FROM matches_unpartitioned) seasons;
+
+INSERT INTO matches (
+    match_id, season, date_of_match, team_id, opponent_id, xg, xga, goals, opponent_goals,
+    status_of_match, result, location_of_match, rolling_xg, rolling_xga, rolling_xg_diff,
+    rolling_xga_diff, form_rolling_5, form_rolling_10, opponent_form_rolling_3,
+    opponent_form_rolling_6, h2h_form_rolling_2, h2h_venue_form_rolling_2,
+    venue_form_rolling_5, row_hash
+)
+SELECT
+    match_id, season_of(date_of_match), date_of_match, team_id, opponent_id, xg, xga, goals, opponent_goals,
+    status_of_match, result, location_of_match, rolling_xg, rolling_xga, rolling_xg_diff,
+    rolling_xga_diff, form_rolling_5, form_rolling_10, opponent_form_rolling_3,
+    opponent_form_rolling_6, h2h_form_rolling_2, h2h_venue_form_rolling_2,
+    venue_form_rolling_5, row_hash
+FROM matches_unpartitioned;
+
+-- The sequence keeps counting from the old table's last id
+ALTER SEQUENCE matches_match_id_seq OWNED BY matches.match_id;
+DROP TABLE matches_unpartitioned;
+
+CREATE INDEX matches_team_date_idx ON matches (team_id, date_of_match DESC);
+CREATE INDEX matches_team_stats_idx ON matches (team_id)
+    INCLUDE (goals, opponent_goals, xg, xga, form_rolling_5);
+CREATE INDEX matches_played_idx ON matches (team_id, date_of_match, match_id)
+    WHERE status_of_match = 'yes';
+
+-- Same feature refresh as init.sql, now pruning partitions by season
+CREATE OR REPLACE PROCEDURE refresh_match_features(since TIMESTAMP DEFAULT NULL)
+LANGUAGE SQL
+AS $$
+    WITH affected AS (
+        SELECT DISTINCT team_id
+        FROM matches
+        WHERE since IS NULL OR (season >= season_of(since) AND date_of_match >= since)
+    ),
+    history AS (
+        SELECT m.match_id, m.season, m.date_of_match, m.team_id, m.opponent_id, m.location_of_match,
+               m.xg, m.xga, m.result,
+               m.xg - m.goals AS xg_diff,
+               m.xga - m.opponent_goals AS xga_diff
+        FROM matches m
+        JOIN affected a ON a.team_id = m.team_id
+        WHERE m.status_of_match = 'yes'
+    ),
+    features AS (
+        SELECT match_id, season, date_of_match,
+            AVG(xg) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS rolling_xg,
+            AVG(xga) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS rolling_xga,
+            AVG(xg_diff) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS rolling_xg_diff,
+            AVG(xga_diff) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS rolling_xga_diff,
+            AVG(result) OVER (team_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS form_rolling_5,
+            AVG(result) OVER (team_matches ROWS BETWEEN 10 PRECEDING AND 1 PRECEDING) AS form_rolling_10,
+            AVG(result) OVER (team_matches ROWS BETWEEN 3 PRECEDING AND 1 PRECEDING) AS opponent_form_rolling_3,
+            AVG(result) OVER (team_matches ROWS BETWEEN 6 PRECEDING AND 1 PRECEDING) AS opponent_form_rolling_6,
+            AVG(result) OVER (pair_matches ROWS BETWEEN 2 PRECEDING AND 1 PRECEDING) AS h2h_form_rolling_2,
+            AVG(result) OVER (pair_venue_matches ROWS BETWEEN 2 PRECEDING AND 1 PRECEDING) AS h2h_venue_form_rolling_2,
+            AVG(result) OVER (venue_matches ROWS BETWEEN 5 PRECEDING AND 1 PRECEDING) AS venue_form_rolling_5
+        FROM history
+        WINDOW
+            team_matches AS (PARTITION BY team_id ORDER BY date_of_match, match_id),
+            pair_matches AS (PARTITION BY team_id, opponent_id ORDER BY date_of_match, match_id),
+            pair_venue_matches AS (PARTITION BY team_id, opponent_id, location_of_match ORDER BY date_of_match, match_id),
+            venue_matches AS (PARTITION BY team_id, location_of_match ORDER BY date_of_match, match_id)
+    )
+    UPDATE matches m
+    SET rolling_xg = f.rolling_xg,
+        rolling_xga = f.rolling_xga,
+        rolling_xg_diff = f.rolling_xg_diff,
+        rolling_xga_diff = f.rolling_xga_diff,
+        form_rolling_5 = f.form_rolling_5,
+        form_rolling_10 = f.form_rolling_10,
+        opponent_form_rolling_3 = f.opponent_form_rolling_3,
+        opponent_form_rolling_6 = f.opponent_form_rolling_6,
+        h2h_form_rolling_2 = f.h2h_form_rolling_2,
+        h2h_venue_form_rolling_2 = f.h2h_venue_form_rolling_2,
+        venue_form_rolling_5 = f.venue_form_rolling_5
+    FROM features f
+    WHERE m.match_id = f.match_id
+      AND m.season = f.season
+      AND (since IS NULL OR f.date_of_match >= since)
+      -- Skip rows whose features didn't change, leaving no dead tuples
+      AND (m.rolling_xg, m.rolling_xga, m.rolling_xg_diff, m.rolling_xga_diff,
+           m.form_rolling_5, m.form_rolling_10, m.opponent_form_rolling_3, m.opponent_form_rolling_6,
+           m.h2h_form_rolling_2, m.h2h_venue_form_rolling_2, m.venue_form_rolling_5)
+          IS DISTINCT FROM
+          (f.rolling_xg, f.rolling_xga, f.rolling_xg_diff, f.rolling_xga_diff,
+           f.form_rolling_5, f.form_rolling_10, f.opponent_form_rolling_3, f.opponent_form_rolling_6,
+           f.h2h_form_rolling_2, f.h2h_venue_form_rolling_2, f.venue_form_rolling_5);
+$$;
+
+COMMIT;
+
+ANALYZE matches;
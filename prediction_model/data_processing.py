@@ -1,8 +1,11 @@
 from sklearn.preprocessing import StandardScaler, MinMaxScaler, RobustScaler, LabelEncoder
 
+# Repeated strings from the API as categoricals
+CATEGORICAL_COLUMNS = ['team', 'opponent', 'status_of_match', 'location_of_match']
+
 class DataProcessing:
     def __init__(self, df):
-        self.df = df
+        self.df = df.astype({col: 'category' for col in CATEGORICAL_COLUMNS if col in df.columns})
         self.label_encoders = {}
 
     def remove_future_games(self):
@@ -36,7 +39,6 @@ class DataProcessing:
 
     def create_training_data(self):
         print(self.df['team'].unique())
-        data = self.df.copy()
         data = self.remove_future_games()
         data = self.process_numerical_columns()
         data = self.process_categorical_columns()
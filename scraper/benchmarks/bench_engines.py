@@ -0,0 +1,89 @@
+"""
+Side-by-side benchmark of the pandas and polars DataProcessor engines on a
+synthetic multi-league history (20-team double round robins, one frame per
+league season). Both outputs are checked to be identical:
+
+    python benchmarks/bench_engines.py --leagues 1 10 50 --seasons 8
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from processor import DataProcessor
+
+TEAMS_PER_LEAGUE = 20
+
+def round_robin(teams):
+    """Double round robin by the circle method: (round, home, away) per fixture."""
+    rotation = list(range(teams))
+    fixtures = []
+    for round_number in range(teams - 1):
+        for i in range(teams // 2):
+            fixtures.append((round_number, rotation[i], rotation[teams - 1 - i]))
+        rotation = [rotation[0]] + [rotation[-1]] + rotation[1:-1]
+    fixtures += [(round_number + teams - 1, away, home) for round_number, home, away in fixtures]
+    return np.array(fixtures).T
+
+def make_season(league, season, rng):
+    """One raw fixtures frame: every pairing home and away, a few unplayed."""
+    teams = np.array([f'League {league:03d} Team {i:02d}' for i in range(TEAMS_PER_LEAGUE)])
+    rounds, home, away = round_robin(TEAMS_PER_LEAGUE)
+    rows = len(home)
+
+    # One round a week, so no team plays twice on the same date
+    dates = pd.Timestamp(f'20{season}-08-10') + pd.to_timedelta(rounds * 7, unit='D')
+    score = pd.Series([f'{h}–{a}' for h, a in rng.integers(0, 5, (rows, 2))], dtype=object)
+    unplayed = rng.random(rows) < 0.02
+    score[unplayed] = np.nan
+    xg = rng.uniform(0, 3, (rows, 2)).round(1)
+    xg[unplayed] = np.nan
+    return pd.DataFrame({
+        'Wk': rounds + 1,
+        'Day': dates.strftime('%a'),
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Time': '15:00',
+        'Home': teams[home],
+        'xG': xg[:, 0],
+        'Score': score,
+        'xG.1': xg[:, 1],
+        'Away': teams[away],
+        'season': season
+    })
+
+def make_frames(leagues, seasons, seed=0):
+    rng = np.random.default_rng(seed)
+    return [make_season(league, season, rng) for season in range(17, 17 + seasons) for league in range(leagues)]
+
+def timed(engine, frames):
+    processor = DataProcessor(engine=engine)
+    start = time.perf_counter()
+    # process_data prints a preview; keep the timing output readable
+    stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        result = processor.process_data(iter(frames))
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--leagues', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--seasons', type=int, default=8)
+    args = parser.parse_args()
+
+    for leagues in args.leagues:
+        frames = make_frames(leagues, args.seasons, seed=leagues)
+        pandas_df, pandas_seconds = timed('pandas', frames)
+        polars_df, polars_seconds = timed('polars', frames)
+        pd.testing.assert_frame_equal(pandas_df, polars_df, check_exact=True)
+
+        print(f"{leagues:>4} leagues {len(pandas_df):>9} team rows  pandas {pandas_seconds:7.3f}s"
+              f"  polars {polars_seconds:7.3f}s  ({pandas_seconds / polars_seconds:.1f}x)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Verifies the rolling and head-to-head feature engines against
+straightforward grouped reference implementations and times them at 1x, 10x and 100x the row count
+of an eight-season Premier League history:
+
+    python benchmarks/bench_features.py --scales 1 10 100
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from features import REGISTRY, ROLLING_FEATURES, HEAD_TO_HEAD_FEATURES, get_source
+from head_to_head import HeadToHeadIndex
+
+BASE_ROWS = 8 * 380
+
+def make_team_frame(rows, seed=0):
+    """Synthetic team-match rows: ~38 matches per team per season."""
+    rng = np.random.default_rng(seed)
+    teams = max(20, rows // 152)
+    names = np.array([f'Team {i:04d}' for i in range(teams)])
+    goals = rng.integers(0, 5, rows)
+    opponent_goals = rng.integers(0, 5, rows)
+    return pd.DataFrame({
+        'Team': names[rng.integers(0, teams, rows)],
+        'Opponent': names[rng.integers(0, teams, rows)],
+        'xg': rng.uniform(0, 3, rows).round(1),
+        'xga': rng.uniform(0, 3, rows).round(1),
+        'goals': goals,
+        'opponent_goals': opponent_goals,
+        'Date': pd.Timestamp('2017-08-01') + pd.to_timedelta(np.sort(rng.integers(0, 8 * 365, rows)), unit='D'),
+        'Result': np.where(goals > opponent_goals, 3, np.where(goals == opponent_goals, 1, 0)),
+        'location': np.array(['home', 'away'])[rng.integers(0, 2, rows)]
+    })
+
+def reference_features(df):
+    """One team at a time with pandas shift/rolling; slow but obviously right."""
+    parts = []
+    for _, team in df.sort_values(['Team', 'Date'], kind='stable').groupby('Team', sort=False):
+        team = team.copy()
+        for name, (source, window) in ROLLING_FEATURES.items():
+            team[name] = get_source(team, source).shift().rolling(window=window, min_periods=1).mean()
+        parts.append(team)
+    return pd.concat(parts).loc[df.index]
+
+def reference_head_to_head(df):
+    """Grouped shift/rolling per head-to-head key."""
+    columns = {}
+    for name, (group, source, window) in HEAD_TO_HEAD_FEATURES.items():
+        ordered = df.sort_values(list(group) + ['Date'], kind='stable')
+        rolled = ordered.groupby(list(group), sort=False)[source].transform(
+            lambda values: values.shift().rolling(window=window, min_periods=1).mean())
+        columns[name] = rolled.loc[df.index]
+    return pd.DataFrame(columns, index=df.index)
+
+def legacy_features(df):
+    """The previous whole-frame implementation, kept for timing only."""
+    team_df = df.sort_values(['Team', 'Date'])
+    team_df = team_df.groupby('Team', group_keys=False).apply(lambda x: x)
+    team_df['rolling_xg'] = team_df['xg'].shift().rolling(window=5, min_periods=1).mean()
+    team_df['rolling_xga'] = team_df['xga'].shift().rolling(window=5, min_periods=1).mean()
+    team_df['rolling_xg_diff'] = team_df.shift().apply(lambda row: row['xg'] - row['goals'], axis=1).rolling(window=5, min_periods=1).mean()
+    team_df['rolling_xga_diff'] = team_df.shift().apply(lambda row: row['xga'] - row['opponent_goals'], axis=1).rolling(window=5, min_periods=1).mean()
+    team_df['form_rolling_5'] = team_df['Result'].shift().rolling(window=5, min_periods=1).mean()
+    team_df['form_rolling_10'] = team_df['Result'].shift().rolling(window=10, min_periods=1).mean()
+    team_df['opponent_form_rolling_3'] = team_df['Result'].shift().rolling(window=3, min_periods=1).mean()
+    team_df['opponent_form_rolling_6'] = team_df['Result'].shift().rolling(window=6, min_periods=1).mean()
+    return team_df
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--skip-legacy', action='store_true', help='the legacy path is very slow at 100x')
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        df = make_team_frame(BASE_ROWS * scale, seed=scale)
+        engine, engine_seconds = timed(lambda frame: REGISTRY.compute(frame, list(ROLLING_FEATURES)), df)
+        reference, reference_seconds = timed(reference_features, df)
+
+        columns = list(ROLLING_FEATURES)
+        assert engine.index.equals(reference.index)
+        np.testing.assert_allclose(engine[columns].to_numpy(), reference[columns].to_numpy(), rtol=1e-12, atol=1e-12)
+
+        h2h, h2h_seconds = timed(lambda frame: HeadToHeadIndex(frame).compute(), df)
+        h2h_reference, h2h_reference_seconds = timed(reference_head_to_head, df)
+        columns = list(HEAD_TO_HEAD_FEATURES)
+        np.testing.assert_allclose(h2h[columns].to_numpy(), h2h_reference[columns].to_numpy(), rtol=1e-12, atol=1e-12)
+
+        line = (f"{scale:>4}x {len(df):>9} rows  engine {engine_seconds:7.3f}s  per-team reference {reference_seconds:7.3f}s"
+                f"  h2h index {h2h_seconds:7.3f}s  h2h reference {h2h_reference_seconds:7.3f}s")
+        if not args.skip_legacy:
+            _, legacy_seconds = timed(legacy_features, df)
+            line += f"  legacy {legacy_seconds:7.3f}s"
+        print(line)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Scraper throughput benchmark, run entirely offline through the replay
+harness. Uses recorded pages when --archive is given, otherwise
+synthesizes fbref-style pages:
+
+    python benchmarks/bench_scraper.py --seasons 17 18 19 20 21 22 23 24
+    python benchmarks/bench_scraper.py --archive data/replay --seasons 22 23
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from io import StringIO
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from http_fetcher import find_table_html
+from parsing import drop_header_rows
+from replay import PageArchive, ReplayServer, replay_scraper, synthesize_pages
+
+def report(stage, seconds, pages, rows):
+    print(f"{stage:<22} {seconds:8.3f}s {pages / seconds:10.1f} pages/s {rows / seconds:12.0f} rows/s")
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+def quietly(func):
+    """Runs func with the scraper's progress output suppressed."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func()
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--archive', help='directory written by replay.py record')
+    parser.add_argument('--seasons', type=int, nargs='+', default=[17, 18, 19, 20, 21, 22, 23, 24])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.archive:
+        archive = PageArchive(args.archive)
+    else:
+        archive = synthesize_pages(args.seasons, tempfile.mkdtemp())
+
+    scraper = replay_scraper(args.seasons, archive)
+    pages = [(season, archive.load(scraper.get_url(season))) for season in args.seasons]
+    pages = [(season, page) for season, page in pages if page is not None]
+    count = len(pages)
+    if count == 0:
+        raise SystemExit("No pages in the archive for the requested seasons")
+
+    tables, seconds = timed(lambda: [find_table_html(page, scraper.get_table_id(season)) for season, page in pages], args.repeat)
+    raw_rows = sum(table.count('<tr') for table in tables)
+    report('table extraction', seconds, count, raw_rows)
+
+    frames, seconds = timed(lambda: [pd.read_html(StringIO(table))[0] for table in tables], args.repeat)
+    report('frame construction', seconds, count, sum(len(df) for df in frames))
+
+    filtered, seconds = timed(lambda: [drop_header_rows(df) for df in frames], args.repeat)
+    rows = sum(len(df) for df in filtered)
+    report('header filtering', seconds, count, rows)
+
+    with ReplayServer(archive) as server:
+        _, seconds = timed(lambda: quietly(replay_scraper(args.seasons, archive, server).get_tables), args.repeat)
+        report('end to end (http)', seconds, count, rows)
+
+    _, seconds = timed(lambda: quietly(replay_scraper(args.seasons, archive, page_timeout=5).get_tables), args.repeat)
+    report('end to end (driver)', seconds, count, rows)
+
+if __name__ == '__main__':
+    main()
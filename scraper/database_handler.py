@@ -1,18 +1,47 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from datetime import datetime
+import io
 import time
 import pandas as pd
+from db_engine import get_engine
+from features import REGISTRY
+from schema import report_memory
+from team_resolver import TeamResolver
+
+# Match facts: frame column -> (matches column, SQL type)
+FACT_COLUMNS = {
+    'xg': ('xg', 'float'),
+    'xga': ('xga', 'float'),
+    'goals': ('goals', 'integer'),
+    'opponent_goals': ('opponent_goals', 'integer'),
+    'Status': ('status_of_match', 'varchar'),
+    'Result': ('result', 'integer'),
+    'location': ('location_of_match', 'varchar')
+}
+
+# Computed features, stored under their own names as floats
+FEATURE_COLUMNS = REGISTRY.names()
+
+# Match key; the upsert also includes season, which follows from the date
+MATCH_KEY = ['date_of_match', 'team_id', 'opponent_id']
+
+# Rows per COPY chunk, bounding the CSV buffer for full-history loads
+COPY_CHUNK_ROWS = 100000
+
+def row_hashes(df):
+    """Content hash of each row as a signed 64-bit integer, stored in matches.row_hash (BIGINT)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().view('int64')
 
 class DatabaseHandler:
     def __init__(self, db_config, df):
         self.db_config = db_config
         self.df = df
         self.engine = self.create_connection()
+        self.teams = TeamResolver(self.engine)
 
     def create_connection(self):
-        # Create PostgreSQL connection URL
-        db_url = f"postgresql://{self.db_config['user']}:{self.db_config['password']}@{self.db_config['host']}:{self.db_config['port']}/{self.db_config['database']}"
-        return create_engine(db_url)
+        # Pooled engine shared by every handler in the process
+        return get_engine(self.db_config)
 
     def insert_data(self):
         try:
@@ -32,27 +61,14 @@ class DatabaseHandler:
         
     def insert_teams(self):
         try:
-            # Get unique teams from both Team and Opponent columns
-            # teams = pd.concat([
-            #     self.df['Team'].unique(),
-            #     self.df['Opponent'].unique()
-            # ]).unique()
-
-            teams = self.df['Team'].unique()
-            
-            # Create DataFrame of teams
-            teams_df = pd.DataFrame({'team_name': teams})
-            
-            # Insert teams with ON CONFLICT DO NOTHING to handle existing teams
-            with self.engine.connect() as conn:
-                conn.execute(text("""
-                    INSERT INTO teams (team_name)
-                    SELECT unnest(:teams)
-                    ON CONFLICT (team_name) DO NOTHING
-                """), {'teams': list(teams)})
-                conn.commit()
-            
-            print(f"Successfully processed {len(teams)} teams")
+            # Teams and opponents, so every match row gets both ids
+            names = pd.concat([pd.Series(self.df['Team'].unique()), pd.Series(self.df['Opponent'].unique())])
+            unresolved = self.teams.resolve(names)
+            if unresolved:
+                print(f"Error inserting teams: no id for {unresolved}")
+                return False
+
+            print(f"Successfully processed {names.nunique()} teams")
             return True
         except Exception as e:
             print(f"Error inserting teams: {str(e)}")
@@ -60,103 +76,122 @@ class DatabaseHandler:
 
     def get_team_ids(self):
         try:
-            # Get team ID mappings
-            with self.engine.connect() as conn:
-                result = conn.execute(text("SELECT team_id, team_name FROM teams"))
-                team_mapping = {row.team_name: row.team_id for row in result}
-            
-            # Add team_id and opponent_id columns
-            self.df['team_id'] = self.df['Team'].map(team_mapping)
-            self.df['opponent_id'] = self.df['Opponent'].map(team_mapping)
-            
+            # Team columns are categorical; each category is looked up once
+            self.df['team_id'] = self.teams.map_ids(self.df['Team'])
+            self.df['opponent_id'] = self.teams.map_ids(self.df['Opponent'])
+            # NULL ids never conflict on the match key, so they would pile up as duplicates
+            missing = self.df['team_id'].isna() | self.df['opponent_id'].isna()
+            if missing.any():
+                print(f"Error getting team IDs: {missing.sum()} rows without an id")
+                return False
             return True
         except Exception as e:
             print(f"Error getting team IDs: {str(e)}")
             return False
 
-    def insert_data_safe(self):
+    def get_insert_columns(self):
+        """Matches columns to load: the facts plus whichever features the frame has."""
+        columns = dict(FACT_COLUMNS)
+        for feature in FEATURE_COLUMNS:
+            if feature in self.df.columns:
+                columns[feature] = (feature, 'float')
+        return columns
+
+    def copy_frame(self, cursor, table, df):
+        """Streams df into table with COPY FROM STDIN, as CSV in bounded chunks."""
+        columns = ', '.join(df.columns)
+        for start in range(0, len(df), COPY_CHUNK_ROWS):
+            buffer = io.StringIO()
+            # Empty fields (NaN, None, '') load as NULL
+            df.iloc[start:start + COPY_CHUNK_ROWS].to_csv(buffer, index=False, header=False)
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '')", buffer)
+
+    def stored_hashes(self, conn, df):
+        """row_hash of the matches rows within df's date range, by match key."""
+        result = conn.execute(text("""
+            SELECT date_of_match, team_id, opponent_id, row_hash
+            FROM matches
+            WHERE date_of_match BETWEEN :first AND :last
+              AND season BETWEEN season_of(:first) AND season_of(:last)
+        """), {'first': df['date_of_match'].min().to_pydatetime(), 'last': df['date_of_match'].max().to_pydatetime()})
+        stored = pd.DataFrame(result.fetchall(), columns=MATCH_KEY + ['stored_hash'])
+        return stored.astype({'date_of_match': 'datetime64[ns]', 'team_id': 'Int64',
+                              'opponent_id': 'Int64', 'stored_hash': 'Int64'})
+
+    def changed_rows(self, conn, df):
+        """The rows of df that are new or whose content hash differs from the stored one."""
+        merged = df[MATCH_KEY + ['row_hash']].merge(self.stored_hashes(conn, df), on=MATCH_KEY, how='left')
+        changed = (merged['stored_hash'] != merged['row_hash']).fillna(True).to_numpy(dtype=bool)
+        return df[changed]
+
+    def insert_data_safe(self, delta=False):
+        """
+        Upserts the frame into matches. With delta=True only rows that are new
+        or changed since the last load are sent; either way rows whose content
+        hash is unchanged are never rewritten.
+        """
         try:
-            # First, insert teams and get their IDs
-            self.insert_teams()
-            self.get_team_ids()
-            
-            # Create temporary table
-            temp_table_name = 'temp_matches'
-            temp_df = self.df.copy()
-            
-            # Replace empty strings or other null-like values with None/NULL
-            temp_df = temp_df.replace(['', 'None', 'NULL'], None)
-            # Convert numeric columns to float to handle NaN properly
-            numeric_columns = ['xg', 'xga', 'goals', 'opponent_goals', 
-                             'rolling_xg', 'rolling_xga', 'rolling_xg_diff', 
-                             'rolling_xga_diff', 'form_rolling_5', 'form_rolling_10',
-                             'opponent_form_rolling_3', 'opponent_form_rolling_6']
-            temp_df[numeric_columns] = temp_df[numeric_columns].astype(float)
-            
-            # Insert into temporary table
-            temp_df.to_sql(
-                temp_table_name,
-                self.engine,
-                if_exists='replace',
-                index=False
-            )
+            # First, insert teams and get their IDs; nothing is sent without them
+            if not self.insert_teams() or not self.get_team_ids():
+                return False
+
+            columns = self.get_insert_columns()
+            content = [target for target, _ in columns.values()]
+            temp_df = self.df[['Date', 'team_id', 'opponent_id'] + list(columns)]
+            temp_df.columns = MATCH_KEY + content
+            temp_df = temp_df.assign(row_hash=row_hashes(temp_df[content]))
+            report_memory('database load', temp_df)
+
+            targets = ', '.join(temp_df.columns)
+            definitions = ', '.join(f"{target} {sql_type}" for target, sql_type in columns.values())
+            updates = ', '.join(f"{target} = EXCLUDED.{target}" for target in content + ['row_hash'])
+
+            # One transaction: a typed temp table (never WAL-logged, dropped on
+            # commit) filled by COPY, then a single upsert into matches
+            start = time.perf_counter()
+            with self.engine.begin() as conn:
+                if delta and len(temp_df):
+                    temp_df = self.changed_rows(conn, temp_df)
+                    print(f"Delta sync: {len(temp_df)} of {len(self.df)} rows are new or changed")
 
-            # Insert from temp table to main table
-            with self.engine.connect() as conn:
                 conn.execute(text(f"""
-                    INSERT INTO matches (
-                        date_of_match, team_id, opponent_id,
-                        xg, xga, goals, opponent_goals,
-                        status_of_match, result, location_of_match,
-                        rolling_xg, rolling_xga,
-                        rolling_xg_diff, rolling_xga_diff,
-                        form_rolling_5, form_rolling_10,
-                        opponent_form_rolling_3, opponent_form_rolling_6
-                    )
-                    SELECT 
-                        "Date"::timestamp, team_id, opponent_id,
-                        NULLIF(xg, 'NaN')::float,
-                        NULLIF(xga, 'NaN')::float,
-                        NULLIF(goals, 'NaN')::integer,
-                        NULLIF(opponent_goals, 'NaN')::integer,
-                        NULLIF("Status", '')::varchar,
-                        NULLIF("Result", 'NaN')::integer,
-                        NULLIF(location, '')::varchar,
-                        NULLIF(rolling_xg, 'NaN')::float,
-                        NULLIF(rolling_xga, 'NaN')::float,
-                        NULLIF(rolling_xg_diff, 'NaN')::float,
-                        NULLIF(rolling_xga_diff, 'NaN')::float,
-                        NULLIF(form_rolling_5, 'NaN')::float,
-                        NULLIF(form_rolling_10, 'NaN')::float,
-                        NULLIF(opponent_form_rolling_3, 'NaN')::float,
-                        NULLIF(opponent_form_rolling_6, 'NaN')::float
-                    FROM {temp_table_name}
-                    ON CONFLICT (date_of_match, team_id, opponent_id)
-                    DO UPDATE SET
-                        xg = EXCLUDED.xg,
-                        xga = EXCLUDED.xga,
-                        goals = EXCLUDED.goals,
-                        opponent_goals = EXCLUDED.opponent_goals,
-                        status_of_match = EXCLUDED.status_of_match,
-                        result = EXCLUDED.result,
-                        rolling_xg = EXCLUDED.rolling_xg,
-                        rolling_xga = EXCLUDED.rolling_xga,
-                        rolling_xg_diff = EXCLUDED.rolling_xg_diff,
-                        rolling_xga_diff = EXCLUDED.rolling_xga_diff,
-                        form_rolling_5 = EXCLUDED.form_rolling_5,
-                        form_rolling_10 = EXCLUDED.form_rolling_10,
-                        opponent_form_rolling_3 = EXCLUDED.opponent_form_rolling_3,
-                        opponent_form_rolling_6 = EXCLUDED.opponent_form_rolling_6
+                    CREATE TEMP TABLE temp_matches (
+                        date_of_match timestamp, team_id integer, opponent_id integer, {definitions}, row_hash bigint
+                    ) ON COMMIT DROP
                 """))
-                conn.commit()
+                self.copy_frame(conn.connection.cursor(), 'temp_matches', temp_df)
+                conn.execute(text("""
+                    SELECT create_season_partition(season)
+                    FROM (SELECT DISTINCT season_of(date_of_match) AS season FROM temp_matches) seasons
+                """))
+                written = conn.execute(text(f"""
+                    INSERT INTO matches ({targets}, season)
+                    SELECT {targets}, season_of(date_of_match) FROM temp_matches
+                    ON CONFLICT (date_of_match, team_id, opponent_id, season)
+                    DO UPDATE SET {updates}
+                    WHERE matches.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+                """)).rowcount
 
-            # Drop temporary table
+            print(f"Successfully inserted/updated {written} of {len(temp_df)} rows sent to matches table "
+                  f"in {time.perf_counter() - start:.2f} seconds")
+            return True
+        except Exception as e:
+            print(f"Error inserting data: {str(e)}")
+            return False
+
+    def refresh_features(self, since=None):
+        """
+        Recomputes the feature columns in Postgres (see refresh_match_features
+        in init.sql) for matches on or after `since`, or all matches.
+        """
+        try:
+            start = time.perf_counter()
             with self.engine.connect() as conn:
-                conn.execute(text(f"DROP TABLE IF EXISTS {temp_table_name}"))
+                conn.execute(text("CALL refresh_match_features(:since)"), {'since': since})
                 conn.commit()
-
-            print(f"Successfully inserted/updated {len(self.df)} rows in matches table")
+            print(f"Refreshed features in the database in {time.perf_counter() - start:.2f} seconds")
             return True
         except Exception as e:
-            print(f"Error inserting data: {str(e)}")
-            return False
\ No newline at end of file
+            print(f"Error refreshing features: {str(e)}")
+            return False
@@ -0,0 +1,86 @@
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL
+
+# Pool settings, each overridable with the environment variable named in
+# the second field. Connections are checked with a ping before use and
+# replaced after `recycle` seconds; statements time out server-side.
+POOL_SETTINGS = {
+    'pool_size': (5, 'DB_POOL_SIZE'),
+    'max_overflow': (10, 'DB_MAX_OVERFLOW'),
+    'pool_timeout': (30, 'DB_POOL_TIMEOUT'),
+    'pool_recycle': (1800, 'DB_POOL_RECYCLE'),
+    'statement_timeout_ms': (300000, 'DB_STATEMENT_TIMEOUT_MS')
+}
+
+# One engine (and pool) per database URL for the whole process
+ENGINES = {}
+POOL_COUNTERS = {}
+
+def database_config(environ=os.environ):
+    """Connection settings from the POSTGRES_* variables set in docker-compose.yaml."""
+    return {
+        'user': environ.get('POSTGRES_USER', 'postgres'),
+        'password': environ.get('POSTGRES_PASSWORD', 'postgres'),
+        'host': environ.get('POSTGRES_HOST', 'db'),
+        'port': environ.get('POSTGRES_PORT', '5432'),
+        'database': environ.get('POSTGRES_DB', 'premier_league')
+    }
+
+def pool_settings(environ=os.environ):
+    return {name: int(environ.get(variable, default)) for name, (default, variable) in POOL_SETTINGS.items()}
+
+def database_url(db_config):
+    return URL.create(
+        'postgresql+psycopg2',
+        username=db_config['user'],
+        password=db_config['password'],
+        host=db_config['host'],
+        port=int(db_config['port']),
+        database=db_config['database']
+    )
+
+def counter(counters, name):
+    def listener(*args):
+        counters[name] += 1
+    return listener
+
+def get_engine(db_config=None):
+    """The shared pooled engine for db_config (the environment's database by default)."""
+    url = database_url(db_config or database_config())
+    key = url.render_as_string(hide_password=False)
+    if key not in ENGINES:
+        settings = pool_settings()
+        engine = create_engine(
+            url,
+            pool_size=settings['pool_size'],
+            max_overflow=settings['max_overflow'],
+            pool_timeout=settings['pool_timeout'],
+            pool_recycle=settings['pool_recycle'],
+            pool_pre_ping=True,
+            connect_args={'options': f"-c statement_timeout={settings['statement_timeout_ms']}"}
+        )
+        counters = POOL_COUNTERS[engine] = {'connects': 0, 'checkouts': 0}
+        event.listen(engine, 'connect', counter(counters, 'connects'))
+        event.listen(engine, 'checkout', counter(counters, 'checkouts'))
+        ENGINES[key] = engine
+    return ENGINES[key]
+
+def pool_stats(engine):
+    """Current pool utilisation, plus how many connections were opened versus reused."""
+    pool = engine.pool
+    counters = POOL_COUNTERS.get(engine, {'connects': 0, 'checkouts': 0})
+    return {
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'checked_in': pool.checkedin(),
+        # overflow() counts down from -pool_size until the pool is full
+        'overflow': max(pool.overflow(), 0),
+        'connects': counters['connects'],
+        'checkouts': counters['checkouts']
+    }
+
+def report_pool(engine):
+    stats = pool_stats(engine)
+    print(f"Connection pool: {stats['checked_out']} of {stats['size']} in use ({stats['overflow']} overflow), "
+          f"{stats['connects']} connections opened for {stats['checkouts']} checkouts")
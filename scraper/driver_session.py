@@ -0,0 +1,96 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+import time
+
+class DriverSession:
+    """
+    Owns a single headless Chrome instance that is reused across page loads.
+    The driver is started lazily, recycled after max_pages loads or when it
+    crashes, and quit when the session context exits.
+    """
+    def __init__(self, options, max_pages=20, retries=1, driver_factory=None, on_start=None):
+        self.options = options
+        self.on_start = on_start
+        self.max_pages = max_pages
+        self.retries = retries
+        self.driver_factory = driver_factory or self.create_driver
+        self.driver = None
+        self.pages_served = 0
+        self.startup_times = []
+        self.page_timings = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.quit()
+        return False
+
+    def create_driver(self):
+        return webdriver.Chrome(options=self.options)
+
+    def start(self):
+        if self.driver is None:
+            print("Starting Chrome driver...")
+            start = time.perf_counter()
+            self.driver = self.driver_factory()
+            self.pages_served = 0
+            if self.on_start is not None:
+                self.on_start(self.driver)
+            elapsed = time.perf_counter() - start
+            self.startup_times.append(elapsed)
+            print(f"Driver started in {elapsed:.2f} seconds")
+        return self.driver
+
+    def quit(self):
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error quitting driver: {str(e)}")
+        finally:
+            self.driver = None
+
+    def load_page(self, url, handler):
+        """
+        Loads url in the shared driver and returns handler(driver).
+        A crashed driver is discarded and the page retried on a fresh one.
+        """
+        for attempt in range(self.retries + 1):
+            if self.driver is not None and self.pages_served >= self.max_pages:
+                print(f"Recycling driver after {self.pages_served} pages")
+                self.quit()
+
+            driver = self.start()
+            start = time.perf_counter()
+            try:
+                driver.get(url)
+                loaded = time.perf_counter()
+                result = handler(driver)
+            except WebDriverException as e:
+                print(f"Driver failed on attempt {attempt + 1}: {e.msg}")
+                self.quit()
+                if attempt == self.retries:
+                    raise
+                continue
+            finally:
+                self.pages_served += 1
+
+            timing = {
+                'url': url,
+                'load_seconds': loaded - start,
+                'total_seconds': time.perf_counter() - start
+            }
+            self.page_timings.append(timing)
+            print(f"Page loaded in {timing['load_seconds']:.2f}s, processed in {timing['total_seconds']:.2f}s")
+            return result
+
+    def report_timings(self):
+        pages = len(self.page_timings)
+        if pages == 0:
+            print("No pages loaded through Chrome")
+            return
+        total = sum(t['total_seconds'] for t in self.page_timings)
+        print(f"Driver starts: {len(self.startup_times)} ({sum(self.startup_times):.2f}s)")
+        print(f"Pages: {pages}, total {total:.2f}s, mean {total / pages:.2f}s per page")
@@ -0,0 +1,194 @@
+from collections import deque
+import json
+import math
+import os
+import pandas as pd
+from sqlalchemy import text
+from features import ROLLING_FEATURES, HEAD_TO_HEAD_FEATURES, get_source
+
+# How many past values each source needs to cover its longest window
+SOURCE_DEPTHS = {}
+for _source, _window in ROLLING_FEATURES.values():
+    SOURCE_DEPTHS[_source] = max(_window, SOURCE_DEPTHS.get(_source, 0))
+
+# Head-to-head buffers are kept per context (opponent, venue, ...) within a team
+CONTEXT_SOURCES = list(dict.fromkeys((group, source) for group, source, _ in HEAD_TO_HEAD_FEATURES.values()))
+CONTEXT_DEPTH = max(window for _, _, window in HEAD_TO_HEAD_FEATURES.values())
+
+def context_key(group, source, row):
+    """e.g. 'Result|Opponent=Chelsea|location=home'; group[0] is always Team."""
+    return '|'.join([source] + [f'{col}={row[col]}' for col in group[1:]])
+
+def to_floats(values):
+    return [float('nan') if value is None else value for value in values]
+
+def to_json_values(values):
+    return [None if math.isnan(value) else value for value in values]
+
+def buffer_mean(buffer, window):
+    recent = [buffer[i] for i in range(max(0, len(buffer) - window), len(buffer))]
+    recent = [value for value in recent if not math.isnan(value)]
+    return sum(recent) / len(recent) if recent else float('nan')
+
+class TeamState:
+    """
+    Fixed-size ring buffers of a team's most recent values per source.
+    """
+    def __init__(self, history=None, last_date=None, contexts=None):
+        history = history or {}
+        # Missing values are stored as None so snapshots stay valid JSON
+        self.buffers = {
+            source: deque(to_floats(history.get(source, [])), maxlen=depth)
+            for source, depth in SOURCE_DEPTHS.items()
+        }
+        self.contexts = {
+            key: deque(to_floats(values), maxlen=CONTEXT_DEPTH)
+            for key, values in (contexts or {}).items()
+        }
+        self.last_date = last_date
+
+    def get_context(self, group, source, row):
+        key = context_key(group, source, row)
+        if key not in self.contexts:
+            self.contexts[key] = deque(maxlen=CONTEXT_DEPTH)
+        return self.contexts[key]
+
+    def features(self, row):
+        """Window means over the buffers; bounded by the longest window, so O(1)."""
+        values = {}
+        for name, (source, window) in ROLLING_FEATURES.items():
+            values[name] = buffer_mean(self.buffers[source], window)
+        for name, (group, source, window) in HEAD_TO_HEAD_FEATURES.items():
+            values[name] = buffer_mean(self.get_context(group, source, row), window)
+        return values
+
+    def push(self, values, match_date, row):
+        for source, buffer in self.buffers.items():
+            buffer.append(float(values[source]))
+        for group, source in CONTEXT_SOURCES:
+            self.get_context(group, source, row).append(float(values[source]))
+        self.last_date = match_date
+
+    def to_dict(self):
+        return {
+            'history': {source: to_json_values(buffer) for source, buffer in self.buffers.items()},
+            'contexts': {key: to_json_values(buffer) for key, buffer in self.contexts.items()},
+            'last_date': self.last_date
+        }
+
+
+class FeatureState:
+    """
+    Per-team feature state that new results can be folded into one at a
+    time, producing the same features as a full recompute.
+    """
+    def __init__(self):
+        self.teams = {}
+
+    def get_team(self, team):
+        if team not in self.teams:
+            self.teams[team] = TeamState()
+        return self.teams[team]
+
+    def load_frame(self, team_df, teams=None):
+        """
+        (Re)builds the state of the given teams, or all teams, from the tail
+        of their team rows. Head-to-head contexts with no rows in team_df,
+        e.g. opponents missing from an incremental batch, keep their buffers.
+        """
+        if teams is not None:
+            team_df = team_df[team_df['Team'].isin(teams)]
+        team_df = team_df.sort_values(['Team', 'Date'], kind='stable')
+        sources = pd.DataFrame({source: get_source(team_df, source) for source in SOURCE_DEPTHS})
+        sources['Team'] = team_df['Team'].values
+        sources['Date'] = team_df['Date'].astype(str).values
+
+        tails = sources.groupby('Team', sort=False, observed=True).tail(max(SOURCE_DEPTHS.values()))
+        for team, rows in tails.groupby('Team', sort=False, observed=True):
+            history = {source: rows[source].tolist()[-depth:] for source, depth in SOURCE_DEPTHS.items()}
+            previous = self.teams.get(team)
+            self.teams[team] = TeamState(history, rows['Date'].iloc[-1])
+            if previous is not None:
+                self.teams[team].contexts = previous.contexts
+
+        for group, source in CONTEXT_SOURCES:
+            values = pd.DataFrame({col: team_df[col].values for col in group})
+            values['value'] = get_source(team_df, source).values
+            tails = values.groupby(list(group), sort=False, observed=True).tail(CONTEXT_DEPTH)
+            for key, rows in tails.groupby(list(group), sort=False, observed=True):
+                row = dict(zip(group, key))
+                self.teams[row['Team']].contexts[context_key(group, source, row)] = deque(rows['value'].tolist(), maxlen=CONTEXT_DEPTH)
+        return self
+
+    def can_fold(self, team_df):
+        """True when every row is newer than what its team has already seen."""
+        dates = team_df['Date'].astype(str)
+        for team, match_date in zip(team_df['Team'], dates):
+            state = self.teams.get(team)
+            if state is not None and state.last_date is not None and match_date <= state.last_date:
+                return False
+        return True
+
+    def fold(self, team_df):
+        """
+        Folds new team rows into the state in date order and returns them
+        with their point-in-time features.
+        """
+        team_df = team_df.sort_values('Date', kind='stable')
+        needed = set(SOURCE_DEPTHS) | {source for _, source in CONTEXT_SOURCES}
+        sources = {source: get_source(team_df, source).tolist() for source in needed}
+        dates = team_df['Date'].astype(str).tolist()
+        contexts = team_df[['Opponent', 'location']].to_dict('records')
+
+        rows = []
+        for i, team in enumerate(team_df['Team']):
+            state = self.get_team(team)
+            rows.append(state.features(contexts[i]))
+            state.push({source: values[i] for source, values in sources.items()}, dates[i], contexts[i])
+
+        features = pd.DataFrame(rows, index=team_df.index)
+        return pd.concat([team_df, features], axis=1)
+
+    def to_dict(self):
+        return {team: state.to_dict() for team, state in self.teams.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls()
+        for team, team_state in data.items():
+            state.teams[team] = TeamState(team_state['history'], team_state['last_date'], team_state.get('contexts'))
+        return state
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def save_to_db(self, engine):
+        rows = [{'team_name': team, 'state': json.dumps(state.to_dict())} for team, state in self.teams.items()]
+        with engine.connect() as conn:
+            conn.execute(text("""
+                INSERT INTO team_feature_state (team_name, state, updated_at)
+                VALUES (:team_name, CAST(:state AS JSONB), CURRENT_TIMESTAMP)
+                ON CONFLICT (team_name)
+                DO UPDATE SET state = EXCLUDED.state, updated_at = EXCLUDED.updated_at
+            """), rows)
+            conn.commit()
+
+    @classmethod
+    def load_from_db(cls, engine):
+        with engine.connect() as conn:
+            result = conn.execute(text("SELECT team_name, state FROM team_feature_state"))
+            data = {row.team_name: row.state for row in result}
+        return cls.from_dict(data) if data else None
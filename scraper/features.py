@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+from schema import widen_floats
+
+TEAM = ('Team',)
+
+class Source:
+    """
+    A per-row input computed from other sources or plain columns, e.g.
+    xg_diff from xg and goals. `compute` only uses arithmetic, so it works on
+    pandas series and polars expressions alike.
+    """
+    def __init__(self, name, inputs, compute):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.compute = compute
+
+
+class Feature:
+    """
+    A rolling feature: the mean of the previous `window` values of `source`
+    among rows sharing the `group` key, excluding the current row.
+    """
+    def __init__(self, name, source, window, group=TEAM):
+        self.name = name
+        self.source = source
+        self.window = window
+        self.group = tuple(group)
+
+
+class FeatureRegistry:
+    """
+    Declared sources and features. Callers ask for a subset of features and
+    only the nodes they depend on are computed, each once per run.
+    """
+    def __init__(self):
+        self.sources = {}
+        self.features = {}
+
+    def add_source(self, name, inputs, compute):
+        self.sources[name] = Source(name, inputs, compute)
+
+    def add_feature(self, name, source, window, group=TEAM):
+        self.features[name] = Feature(name, source, window, group)
+
+    def names(self):
+        return list(self.features)
+
+    def resolve(self, names=None):
+        """The requested features, in registry order."""
+        if names is None:
+            return list(self.features.values())
+        unknown = [name for name in names if name not in self.features]
+        if unknown:
+            raise ValueError(f"Unknown features: {unknown}")
+        return [feature for name, feature in self.features.items() if name in names]
+
+    def compute(self, df, names=None):
+        """Returns df with the requested features added, in its original row order."""
+        features = self.resolve(names)
+        run = FeatureRun(self, df, features)
+        return df.assign(**{feature.name: run.feature(feature) for feature in features})
+
+
+class FeatureRun:
+    """
+    Memoized intermediates for one compute call: sorted group segments,
+    source series and lag matrices are shared by every feature using them.
+    """
+    def __init__(self, registry, df, features):
+        self.registry = registry
+        self.df = df
+        self.cache = {}
+        # Each lag matrix is as deep as the longest requested window using it
+        self.depths = {}
+        for feature in features:
+            key = (feature.source, feature.group)
+            self.depths[key] = max(feature.window, self.depths.get(key, 0))
+
+    def memo(self, key, build):
+        if key not in self.cache:
+            self.cache[key] = build()
+        return self.cache[key]
+
+    def source(self, name):
+        return self.memo(('source', name), lambda: np.asarray(get_source(self.df, name, self.registry), dtype='float64'))
+
+    def segments(self, group):
+        """Row order sorted by group then Date (stable), and each row's segment start."""
+        def build():
+            codes = [pd.factorize(self.df[col], sort=True)[0] for col in group]
+            dates = pd.factorize(self.df['Date'], sort=True)[0]
+            # lexsort sorts by its last key first
+            order = np.lexsort([dates] + codes[::-1])
+            return order, segment_starts([code[order] for code in codes])
+        return self.memo(('segments', group), build)
+
+    def lags(self, source, group):
+        def build():
+            order, starts = self.segments(group)
+            return lag_matrix(self.source(source)[order], starts, self.depths[(source, group)])
+        return self.memo(('lags', source, group), build)
+
+    def feature(self, feature):
+        order, _ = self.segments(feature.group)
+        values = np.empty(len(order))
+        values[order] = window_mean(self.lags(feature.source, feature.group), feature.window)
+        return values
+
+
+REGISTRY = FeatureRegistry()
+
+REGISTRY.add_source('xg_diff', ('xg', 'goals'), lambda xg, goals: xg - goals)
+REGISTRY.add_source('xga_diff', ('xga', 'opponent_goals'), lambda xga, opponent_goals: xga - opponent_goals)
+
+REGISTRY.add_feature('rolling_xg', 'xg', 5)
+REGISTRY.add_feature('rolling_xga', 'xga', 5)
+REGISTRY.add_feature('rolling_xg_diff', 'xg_diff', 5)
+REGISTRY.add_feature('rolling_xga_diff', 'xga_diff', 5)
+REGISTRY.add_feature('form_rolling_5', 'Result', 5)
+REGISTRY.add_feature('form_rolling_10', 'Result', 10)
+REGISTRY.add_feature('opponent_form_rolling_3', 'Result', 3)
+REGISTRY.add_feature('opponent_form_rolling_6', 'Result', 6)
+
+# Head-to-head and venue-split form
+REGISTRY.add_feature('h2h_form_rolling_2', 'Result', 2, group=('Team', 'Opponent'))
+REGISTRY.add_feature('h2h_venue_form_rolling_2', 'Result', 2, group=('Team', 'Opponent', 'location'))
+REGISTRY.add_feature('venue_form_rolling_5', 'Result', 5, group=('Team', 'location'))
+
+# Views of the registry for the per-team state and the head-to-head index:
+# name -> (source, window) and name -> (group, source, window)
+ROLLING_FEATURES = {
+    feature.name: (feature.source, feature.window)
+    for feature in REGISTRY.features.values() if feature.group == TEAM
+}
+HEAD_TO_HEAD_FEATURES = {
+    feature.name: (feature.group, feature.source, feature.window)
+    for feature in REGISTRY.features.values() if feature.group != TEAM
+}
+
+def get_source(df, source, registry=REGISTRY):
+    if source in registry.sources:
+        derived = registry.sources[source]
+        return derived.compute(*[get_source(df, name, registry) for name in derived.inputs])
+    if df[source].dtype == np.float32:
+        # float32 columns (the raw store's xG) back to their scraped decimals,
+        # so every path computes features from the same float64 values
+        return widen_floats(df[[source]])[source]
+    return df[source]
+
+def segment_starts(keys):
+    """
+    For rows sorted so equal keys are contiguous, returns the position of
+    the first row of each row's segment.
+    """
+    n = len(keys[0]) if keys else 0
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    same_as_previous = np.ones(n - 1, dtype=bool)
+    for key in keys:
+        values = np.asarray(key)
+        same_as_previous &= values[1:] == values[:-1]
+    starts = np.flatnonzero(np.concatenate([[True], ~same_as_previous]))
+    return np.repeat(starts, np.diff(np.append(starts, n)))
+
+def lag_matrix(values, starts, depth):
+    """
+    Column k holds the value k + 1 rows earlier in the same segment, or NaN
+    where that would cross the segment start.
+    """
+    values = np.asarray(values, dtype='float64')
+    positions = np.arange(len(values))
+    matrix = np.full((len(values), depth), np.nan)
+    for k in range(depth):
+        lagged = positions - (k + 1)
+        valid = lagged >= starts
+        matrix[valid, k] = values[lagged[valid]]
+    return matrix
+
+def window_mean(matrix, window):
+    """NaN-skipping mean of the first `window` lags, NaN when none exist."""
+    block = matrix[:, :window]
+    counts = (~np.isnan(block)).sum(axis=1)
+    totals = np.nansum(block, axis=1)
+    return np.where(counts > 0, totals / np.maximum(counts, 1), np.nan)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+from features import REGISTRY, HEAD_TO_HEAD_FEATURES, FeatureRun
+
+# Positional fields of a lookup key, in the order the group columns use them
+KEY_FIELDS = ('Team', 'Opponent', 'location')
+
+class GroupIndex:
+    """
+    The run's sorted segments for one group, with the slice each key
+    occupies so a key's match history is a single lookup.
+    """
+    def __init__(self, run, group):
+        self.group = group
+        self.order, starts = run.segments(group)
+        self.dates = pd.to_datetime(run.df['Date']).to_numpy()[self.order]
+
+        first_rows = np.flatnonzero(np.diff(starts, prepend=-1))
+        ends = np.append(first_rows[1:], len(self.order))
+        keys = [run.df[col].to_numpy() for col in group]
+        segment_keys = zip(*[key[self.order[first_rows]].tolist() for key in keys])
+        self.slices = {key: (start, end) for key, start, end in zip(segment_keys, first_rows, ends)}
+
+    def history(self, key, match_date):
+        """Sorted positions of the key's matches strictly before match_date."""
+        start, end = self.slices.get(key, (0, 0))
+        stop = start + np.searchsorted(self.dates[start:end], match_date, side='left')
+        return self.order[start:stop]
+
+
+class HeadToHeadIndex:
+    """
+    Head-to-head and venue features over the registry: compute() shares
+    the run's memoized segments and lags, and lookup() answers single
+    fixtures from the same segments by binary search.
+    """
+    def __init__(self, team_df, names=None, registry=REGISTRY):
+        self.df = team_df
+        self.features = registry.resolve(list(HEAD_TO_HEAD_FEATURES) if names is None else names)
+        self.run = FeatureRun(registry, team_df, self.features)
+        self.groups = {feature.group: GroupIndex(self.run, feature.group) for feature in self.features}
+
+    def compute(self):
+        """Point-in-time features for every indexed row, aligned to the frame."""
+        return pd.DataFrame({feature.name: self.run.feature(feature) for feature in self.features}, index=self.df.index)
+
+    def add_features(self):
+        return pd.concat([self.df, self.compute()], axis=1)
+
+    def lookup(self, team, opponent, location, match_date):
+        """Head-to-head features for one fixture from the team's perspective."""
+        fields = dict(zip(KEY_FIELDS, (team, opponent, location)))
+        match_date = np.datetime64(pd.Timestamp(match_date), 'ns')
+        values = {}
+        for feature in self.features:
+            positions = self.groups[feature.group].history(tuple(fields[col] for col in feature.group), match_date)
+            recent = self.run.source(feature.source)[positions[-feature.window:]]
+            recent = recent[~np.isnan(recent)]
+            values[feature.name] = recent.mean() if len(recent) else np.nan
+        return values
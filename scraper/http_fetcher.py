@@ -0,0 +1,115 @@
+import random
+import requests
+from urllib3.util import Retry
+from requests.adapters import HTTPAdapter
+from lxml import html as lxml_html
+from lxml import etree
+
+class HttpFetcher:
+    """
+    Browserless page fetcher backed by a pooled requests session.
+    """
+    def __init__(self, timeout=30, pool_size=4, retries=3, rate_limiter=None, rate_limit_retries=3, cache=None):
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.rate_limit_retries = rate_limit_retries
+
+        # Configure session with retries, backoff and a reusable connection pool.
+        # 429s are left to the rate limiter so every thread backs off together.
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=1,
+            status_forcelist=[500, 502, 503, 504]
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.user_agents = [
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0',
+            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+        ]
+
+    def get_headers(self):
+        """Get random headers for each request"""
+        return {
+            'User-Agent': random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.5',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive'
+        }
+
+    def fetch(self, url, immutable=False):
+        """
+        Returns the page body, served from the cache when it is still valid.
+        Immutable pages are never re-requested once cached.
+        """
+        entry = self.cache.load(url) if self.cache is not None else None
+        headers = self.get_headers()
+        if entry is not None:
+            # A copy cached while the season was live may predate its last
+            # matchday, so it is revalidated once before it is kept for good
+            if (entry['immutable'] or not immutable) and self.cache.is_fresh(entry):
+                self.cache.record('hits', entry['body'])
+                return entry['body']
+            headers.update(self.cache.get_validators(entry))
+
+        for attempt in range(self.rate_limit_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 429 and self.rate_limiter is not None:
+                # The pause also applies after the last retry, so no other
+                # request (Chrome included) goes to the host straight away
+                self.rate_limiter.backoff(url, self.get_retry_after(response))
+                if attempt < self.rate_limit_retries:
+                    continue
+
+            if response.status_code == 304 and entry is not None:
+                self.cache.record('revalidated', entry['body'])
+                return self.cache.touch(url, entry, immutable)
+
+            response.raise_for_status()
+            if self.rate_limiter is not None:
+                self.rate_limiter.success(url)
+            if self.cache is not None:
+                self.cache.record('misses')
+                self.cache.store(url, response.text, response.headers, immutable)
+            return response.text
+
+    def get_retry_after(self, response):
+        try:
+            return float(response.headers['Retry-After'])
+        except (KeyError, ValueError):
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+def find_table_html(page_html, table_id):
+    """
+    Returns the outer HTML of the table with the given id, or None.
+    fbref ships some tables inside HTML comments, so those are searched too.
+    """
+    tree = lxml_html.fromstring(page_html)
+    tables = tree.xpath('//table[@id=$table_id]', table_id=table_id)
+
+    if not tables:
+        for comment in tree.xpath('//comment()'):
+            if comment.text is None or table_id not in comment.text:
+                continue
+            fragment = lxml_html.fromstring(f'<div>{comment.text}</div>')
+            tables = fragment.xpath('.//table[@id=$table_id]', table_id=table_id)
+            if tables:
+                break
+
+    if not tables:
+        return None
+    return etree.tostring(tables[0], encoding='unicode')
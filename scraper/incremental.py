@@ -0,0 +1,77 @@
+import pandas as pd
+from features import REGISTRY
+from processor import DataProcessor
+
+FIXTURE_KEY = ['Date', 'Home', 'Away']
+RESULT_COLUMNS = ['Score', 'xG', 'xG.1']
+
+# Feature group -> its longest window, e.g. ('Team',) -> 10 (form_rolling_10)
+# and ('Team', 'Opponent') -> 2: how many earlier played rows per group key
+# the rolling windows need to start warm
+CONTEXT_DEPTHS = {}
+for feature in REGISTRY.features.values():
+    CONTEXT_DEPTHS[feature.group] = max(feature.window, CONTEXT_DEPTHS.get(feature.group, 0))
+
+def normalize_fixtures(df):
+    """Brings stored and freshly scraped fixtures to comparable dtypes."""
+    df = df[FIXTURE_KEY + RESULT_COLUMNS].copy()
+    df['Date'] = df['Date'].astype(str)
+    df['Home'] = df['Home'].astype(str)
+    df['Away'] = df['Away'].astype(str)
+    df['Score'] = df['Score'].astype(object).where(df['Score'].notna(), None)
+    # Rounded so float32 values from the raw store match freshly parsed floats
+    df['xG'] = pd.to_numeric(df['xG'], errors='coerce').astype('float64').round(2)
+    df['xG.1'] = pd.to_numeric(df['xG.1'], errors='coerce').astype('float64').round(2)
+    return df
+
+def find_changed_fixtures(stored, scraped):
+    """
+    Returns the scraped fixtures that are new or whose score/xG differs
+    from the stored copy.
+    """
+    merged = normalize_fixtures(scraped).merge(
+        normalize_fixtures(stored).drop_duplicates(FIXTURE_KEY),
+        on=FIXTURE_KEY, how='left', suffixes=('', '_stored'), indicator=True
+    )
+    changed = merged['_merge'] == 'left_only'
+    for col in RESULT_COLUMNS:
+        new, old = merged[col], merged[f'{col}_stored']
+        changed |= ~((new == old) | (new.isna() & old.isna()))
+    return scraped[changed.values]
+
+def is_played(df):
+    """Fixtures build_team_rows keeps: a parsed score and both xG values."""
+    return DataProcessor().sort_data(df).notna().all(axis=1).to_numpy()
+
+def involves(df, teams):
+    return df['Home'].isin(teams) | df['Away'].isin(teams)
+
+def select_update_batch(raw_data, changed):
+    """
+    Picks the raw fixtures needed to recompute features for the changed
+    fixtures: every later fixture of an affected team, plus the earlier
+    played fixtures that fill each window, i.e. the last CONTEXT_DEPTHS
+    rows per team, per team and opponent, per team and venue, and so on.
+    Returns the batch, the cutoff date and the affected teams.
+    """
+    cutoff = changed['Date'].astype(str).min()
+    teams = set(changed['Home']) | set(changed['Away'])
+    dates = raw_data['Date'].astype(str)
+
+    batch = raw_data[(dates >= cutoff) & involves(raw_data, teams)]
+
+    # Only fixtures that become team rows count towards the warm-up
+    prior = raw_data[(dates < cutoff) & involves(raw_data, teams)].reset_index(drop=True)
+    prior = prior[is_played(prior)]
+    appearances = pd.concat([
+        pd.DataFrame({'Date': prior['Date'].astype(str), 'row': prior.index, 'Team': prior['Home'], 'Opponent': prior['Away'], 'location': 'home'}),
+        pd.DataFrame({'Date': prior['Date'].astype(str), 'row': prior.index, 'Team': prior['Away'], 'Opponent': prior['Home'], 'location': 'away'})
+    ])
+    # Same-day fixtures keep their table order, as in the feature windows
+    appearances = appearances[appearances['Team'].isin(teams)].sort_values(['Date', 'row'])
+    keep = set()
+    for group, depth in CONTEXT_DEPTHS.items():
+        keep.update(appearances.groupby(list(group)).tail(depth).index)
+    context = prior.loc[sorted(keep)]
+
+    return pd.concat([context, batch]), cutoff, teams
@@ -1,31 +1,181 @@
 from scraper import MatchScraper
 from processor import DataProcessor
 from database_handler import DatabaseHandler
+from db_engine import database_config, get_engine, report_pool
+from incremental import FIXTURE_KEY, RESULT_COLUMNS, find_changed_fixtures, select_update_batch
+from raw_store import RawStore
+from team_resolver import TeamResolver
+from feature_state import FeatureState
+from processed_cache import ProcessedCache
 import os
+import time
 import pandas as pd
 
+LEGACY_RAW_DATA_PATH = 'data/raw_data.csv'
+
+def open_raw_store(config):
+    store = RawStore(config['raw_store_dir'])
+    if not store.seasons() and os.path.exists(LEGACY_RAW_DATA_PATH):
+        print(f"Importing {LEGACY_RAW_DATA_PATH} into the raw store")
+        store.import_csv(LEGACY_RAW_DATA_PATH)
+    return store
+
+def load_data(config, df):
+    """Upserts df into matches; raises when the load fails so nothing downstream is saved."""
+    db_handler = DatabaseHandler(config['database'], df)
+    if not db_handler.insert_data_safe(delta=config['db_sync'] == 'delta'):
+        raise RuntimeError("Database load failed")
+    return db_handler
+
+def load_database_features(config, df, since=None):
+    """Loads match facts only and has Postgres compute the features from `since` on."""
+    db_handler = load_data(config, df)
+    if not db_handler.refresh_features(since):
+        raise RuntimeError("Feature refresh in the database failed")
+
+def store_seasons(store, scraped_seasons):
+    for season, scraped in scraped_seasons.items():
+        store.write_season(scraped, season)
+
+def read_raw_data(store, scraped_seasons):
+    """All raw fixtures, with the not yet stored scrapes in place of their seasons."""
+    stored = [season for season in store.seasons() if season not in scraped_seasons]
+    frames = [store.read(seasons=stored)] if stored else []
+    frames += [store.to_frame(scraped, season) for season, scraped in scraped_seasons.items()]
+    return pd.concat(frames, ignore_index=True)
+
+def known_teams(config, store, seasons):
+    """
+    Teams seen before this run: the database's teams table plus the stored
+    seasons other than `seasons`. Validation lists any other name as new.
+    """
+    names = TeamResolver(get_engine(config['database'])).load_names()
+    earlier = [season for season in store.seasons() if season not in seasons]
+    if earlier:
+        raw_data = store.read(seasons=earlier, columns=['Home', 'Away'])
+        names |= set(raw_data['Home'].dropna().astype(str)) | set(raw_data['Away'].dropna().astype(str))
+    return names
+
+def run_incremental(config, scraper, store):
+    """
+    Scrapes only seasons that aren't finalized in the raw store and pushes
+    just the changed fixtures (and the rows whose features depend on them)
+    through processing and the database.
+    """
+    # Decided from the stored fixtures rather than the calendar: a partition
+    # written before the last matchday, or of a season that ran late, is rescraped
+    finalized = {season for season in store.seasons() if store.is_complete(season)}
+    scraper.seasons = [season for season in config['seasons'] if season not in finalized]
+    if not scraper.seasons:
+        return "All seasons finalized, nothing to update"
+    print(f"Finalized seasons: {sorted(finalized)}, refreshing: {scraper.seasons}")
+
+    # Diff each season as it is scraped. The raw store is only updated once
+    # the changes reached the database, so a failed run is retried in full.
+    changed = []
+    scraped_seasons = {}
+    stored_seasons = set(store.seasons())
+    for scraped in scraper.iter_tables():
+        season = scraped['season'].iloc[0]
+        if season in stored_seasons:
+            stored = store.read(seasons=[season], columns=FIXTURE_KEY + RESULT_COLUMNS)
+            changed.append(find_changed_fixtures(stored, scraped))
+        else:
+            changed.append(scraped)
+        scraped_seasons[season] = scraped
+
+    changed = pd.concat(changed)
+    if changed.empty:
+        store_seasons(store, scraped_seasons)
+        return "No changed fixtures"
+    print(f"Found {len(changed)} new or changed fixtures")
+
+    processor = DataProcessor(engine=config['engine'])
+    if config['feature_mode'] == 'database':
+        # Later rows of every team playing on or after the earliest change are refreshed in SQL
+        df = processor.process_match_facts(changed)
+        if df.empty:
+            # Only unplayed fixtures changed (e.g. a rescheduled date): no rows to load
+            store_seasons(store, scraped_seasons)
+            return "No played fixtures changed"
+        processor.validate_data(df, known_teams(config, store, scraped_seasons))
+        load_database_features(config, df, since=df['Date'].min().to_pydatetime())
+        store_seasons(store, scraped_seasons)
+        return f"Incremental update completed: {len(df)} rows loaded, features refreshed in the database"
+
+    state = FeatureState.load(config['feature_state_path'])
+    new_rows = processor.build_team_rows(changed)
+
+    if state is not None and state.can_fold(new_rows):
+        # Only results after each team's last known match: fold them into the state
+        print("Folding new results into the saved feature state")
+        df = processor.process_new_results(changed, state)
+    else:
+        raw_data = read_raw_data(store, scraped_seasons)
+        batch, cutoff, teams = select_update_batch(raw_data, changed)
+        processed = processor.process_data(batch)
+        df = processed[(processed['Date'] >= pd.Timestamp(cutoff)) & processed['Team'].isin(teams)]
+        if state is not None:
+            state.load_frame(processed, teams)
+
+    processor.validate_data(df, known_teams(config, store, scraped_seasons))
+    load_data(config, df)
+
+    store_seasons(store, scraped_seasons)
+    if state is not None:
+        state.save(config['feature_state_path'])
+
+    return f"Incremental update completed: {len(df)} rows refreshed"
+
 def run_update(config):
     # Initialize components
+    # Pages come from the on-disk cache, so only the in-progress season is re-requested
+    scraper = MatchScraper(
+        config['seasons'],
+        requests_per_minute=config['requests_per_minute'],
+        max_workers=config['max_workers'],
+        cache_dir=config['cache_dir'],
+        cache_ttl=config['cache_ttl']
+    )
 
-    if os.path.exists('data/raw_data.csv'):
-        raw_data = pd.read_csv('data/raw_data.csv')
+    store = open_raw_store(config)
 
-    else:
-        scraper = MatchScraper(config['seasons'])
-        
-        
-        raw_data = scraper.get_tables()
-        raw_data.to_csv('data/raw_data.csv')
+    if config['mode'] == 'incremental':
+        if store.seasons():
+            return run_incremental(config, scraper, store)
+        print("No raw data stored yet, running a full update")
     
-    processor = DataProcessor()
-    # Process data
-    df = processor.process_data(raw_data)
-    processor.validate_data(df)
+    # Scraped seasons are staged and only committed to the raw store once
+    # they reached the database, so a failed load is retried on the next run
+    staging = store.staging()
+    staging.write_stream(scraper.iter_tables())
+    staging.link_missing(store, config['seasons'])
+
+    processor = DataProcessor(engine=config['engine'])
+    if config['feature_mode'] == 'database':
+        df = processor.process_match_facts(staging.iter_seasons(config['seasons']))
+        processor.validate_data(df, known_teams(config, store, config['seasons']))
+        load_database_features(config, df)
+        store.commit(staging)
+        return "Update completed successfully, features computed in the database"
+
+    # Process data, streaming the raw seasons into the parsing stage, unless
+    # neither the raw data nor the feature code changed since a cached run
+    cache = ProcessedCache(config['processed_cache_dir'])
+    key = cache.get_key(staging.fingerprint(config['seasons']), processor)
+    df = cache.load(key)
+    if df is None:
+        start = time.perf_counter()
+        df = processor.process_data(staging.iter_seasons(config['seasons']))
+        cache.store(key, df, time.perf_counter() - start)
+    cache.report()
+    processor.validate_data(df, known_teams(config, store, config['seasons']))
     
     # Update database
-    db_handler = DatabaseHandler(config['database'], df)
-    
-    db_handler.insert_data_safe()
+    load_data(config, df)
+    store.commit(staging)
+
+    FeatureState().load_frame(df).save(config['feature_state_path'])
     
     # Verify update
     # if not db_handler.verify_update(df):
@@ -36,14 +186,20 @@ def run_update(config):
 if __name__ == "__main__":
     config = {
         'seasons': [17,18,19,20,21,22,23,24],
-        'database': {
-            'user': 'postgres',
-            'password': 'postgres',
-            'host': 'db',
-            'port': '5432',
-            'database': 'premier_league'
-        }
+        'mode': 'incremental',  # 'full' reprocesses every season
+        'engine': 'pandas',  # or 'polars' (lazy query, same output)
+        'feature_mode': 'python',  # 'database' loads match facts and computes features in Postgres
+        'db_sync': 'delta',  # Only send new or changed rows; 'full' sends every row
+        'requests_per_minute': 10,  # fbref.com request budget
+        'max_workers': 4,
+        'cache_dir': 'data/cache',
+        'cache_ttl': 6 * 3600,  # Used when a page has no ETag/Last-Modified
+        'raw_store_dir': 'data/raw',  # One Parquet partition per season
+        'processed_cache_dir': 'data/processed',  # Team frames keyed by raw data + feature code hash
+        'feature_state_path': 'data/feature_state.json',  # Per-team windows for O(1) updates
+        'database': database_config()  # POSTGRES_* environment variables
     }
     
     result = run_update(config)
-    print(result)
\ No newline at end of file
+    print(result)
+    report_pool(get_engine(config['database']))
\ No newline at end of file
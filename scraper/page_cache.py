@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+class PageCache:
+    """
+    On-disk cache of fetched pages keyed by URL. Each entry keeps the body
+    plus the validators needed for conditional revalidation.
+    """
+    def __init__(self, directory='data/cache', ttl=6 * 3600):
+        self.directory = directory
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'bytes_saved': 0}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_path(self, url, extension):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{key}.{extension}')
+
+    def load(self, url):
+        try:
+            with open(self.get_path(url, 'json')) as f:
+                meta = json.load(f)
+            with open(self.get_path(url, 'html'), encoding='utf-8') as f:
+                meta['body'] = f.read()
+            return meta
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url, body, headers, immutable=False):
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'immutable': immutable
+        }
+        self.write(self.get_path(url, 'html'), body)
+        self.write(self.get_path(url, 'json'), json.dumps(meta))
+
+    def write(self, path, content):
+        # Write then rename so a crash never leaves a half-written entry
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def touch(self, url, entry, immutable=False):
+        entry = dict(entry, fetched_at=time.time(), immutable=entry['immutable'] or immutable)
+        body = entry.pop('body')
+        self.write(self.get_path(url, 'json'), json.dumps(entry))
+        return body
+
+    def invalidate(self, url):
+        for extension in ('json', 'html'):
+            try:
+                os.remove(self.get_path(url, extension))
+            except OSError:
+                pass
+
+    def is_fresh(self, entry):
+        """Entries without validators are trusted until the TTL runs out."""
+        if entry['immutable']:
+            return True
+        if entry['etag'] or entry['last_modified']:
+            return False
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def get_validators(self, entry):
+        headers = {}
+        if entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def record(self, outcome, body=None):
+        with self.lock:
+            self.stats[outcome] += 1
+            if body is not None:
+                self.stats['bytes_saved'] += len(body.encode('utf-8'))
+
+    def report(self):
+        stats = self.stats
+        print(f"Page cache: {stats['hits']} hits, {stats['revalidated']} revalidated, "
+              f"{stats['misses']} misses, {stats['bytes_saved'] / 1024:.1f} KB saved")
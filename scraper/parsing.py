@@ -0,0 +1,29 @@
+import numpy as np
+
+# fbref scores use an en dash, e.g. "2–1"
+SCORE_PATTERN = r'(\d+)\s*–\s*(\d+)'
+
+def drop_header_rows(df):
+    """
+    Removes the header rows fbref repeats inside the table body, i.e. rows
+    where every value is one of the column names.
+    """
+    header_values = [str(col) for col in df.columns]
+    is_header = df.astype(str).isin(header_values).all(axis=1)
+    return df[~is_header.values]
+
+def parse_scores(df):
+    """
+    Parses the Score column once and fills every derived column: Status,
+    H.goals/A.goals and Result (3 win, 1 draw, 0 loss for the home side).
+    Goals and Result are nullable integers, missing for unplayed fixtures.
+    """
+    goals = df['Score'].astype('string').str.extract(SCORE_PATTERN)
+    home_goals = goals[0].astype('Int64')
+    away_goals = goals[1].astype('Int64')
+
+    df['Status'] = np.where(df['Score'].isna(), 'no', 'yes')
+    df['H.goals'] = home_goals.values
+    df['A.goals'] = away_goals.values
+    df['Result'] = ((home_goals > away_goals).astype('Int64') * 3 + (home_goals == away_goals).astype('Int64')).values
+    return df
@@ -0,0 +1,129 @@
+import pandas as pd
+import polars as pl
+from parsing import SCORE_PATTERN
+from features import REGISTRY
+from schema import FLOAT32_DECIMALS
+
+# Columns DataProcessor.sort_data keeps; rows missing any of them are dropped
+FIXTURE_COLUMNS = ['Date', 'Day', 'Time', 'Result', 'H.team', 'A.team', 'H.xg', 'A.xg', 'H.goals', 'A.goals', 'Status']
+
+def get_source(source, schema):
+    """Registry sources as polars expressions; derived ones reuse their arithmetic."""
+    if source in REGISTRY.sources:
+        derived = REGISTRY.sources[source]
+        return derived.compute(*[get_source(name, schema) for name in derived.inputs])
+    col = pl.col(source).cast(pl.Float64)
+    if schema[source] == pl.Float32:
+        # Same rounding as schema.widen_floats in the pandas engine
+        col = col.round(FLOAT32_DECIMALS)
+    return col
+
+def to_lazy(frames):
+    """Raw pandas frame(s) to a lazy frame, keeping the pandas index as 'index'."""
+    if not isinstance(frames, pd.DataFrame):
+        # One conversion of the concatenated frames is much cheaper than one per season
+        frames = pd.concat(list(frames))
+    df = frames.rename_axis('index').reset_index()
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(object)
+    return pl.from_pandas(df).lazy()
+
+def to_float(schema, col):
+    """pd.to_numeric(errors='coerce'): numbers keep their dtype, text is parsed."""
+    if schema[col].is_numeric():
+        return pl.col(col)
+    return pl.col(col).cast(pl.Float64, strict=False)
+
+def parse_fixtures(lazy):
+    """DataProcessor.sort_data and the score parsing as one projection."""
+    schema = lazy.collect_schema()
+    date = pl.col('Date')
+    if schema['Date'] == pl.Utf8:
+        date = date.str.to_datetime('%Y-%m-%d', time_unit='ns', strict=False)
+    else:
+        date = date.cast(pl.Datetime('ns'))
+
+    home_goals = pl.col('Score').str.extract(SCORE_PATTERN, 1).cast(pl.Int64)
+    away_goals = pl.col('Score').str.extract(SCORE_PATTERN, 2).cast(pl.Int64)
+    return lazy.select(
+        pl.col('index').cast(pl.Int64),
+        date.alias('Date'),
+        pl.col('Day'),
+        pl.col('Time'),
+        ((home_goals > away_goals).cast(pl.Int64) * 3 + (home_goals == away_goals).cast(pl.Int64)).alias('Result'),
+        pl.col('Home').cast(pl.Utf8).alias('H.team'),
+        pl.col('Away').cast(pl.Utf8).alias('A.team'),
+        to_float(schema, 'xG').fill_nan(None).alias('H.xg'),
+        to_float(schema, 'xG.1').fill_nan(None).alias('A.xg'),
+        home_goals.alias('H.goals'),
+        away_goals.alias('A.goals'),
+        pl.when(pl.col('Score').is_null()).then(pl.lit('no')).otherwise(pl.lit('yes')).alias('Status')
+    ).drop_nulls(FIXTURE_COLUMNS)
+
+def build_team_rows(fixtures):
+    """Home and away perspectives stacked into long-format team rows."""
+    def perspective(team, opponent, location, result):
+        return fixtures.select(
+            pl.col('index'),
+            pl.col(f'{team}.team').alias('Team'),
+            pl.col(f'{opponent}.team').alias('Opponent'),
+            pl.col(f'{team}.xg').alias('xg'),
+            pl.col(f'{opponent}.xg').alias('xga'),
+            pl.col(f'{team}.goals').alias('goals'),
+            pl.col(f'{opponent}.goals').alias('opponent_goals'),
+            pl.col('Date'),
+            pl.col('Status'),
+            result.alias('Result'),
+            pl.lit(location).alias('location')
+        )
+
+    away_result = pl.when(pl.col('Result') == 1).then(1).otherwise(3 - pl.col('Result'))
+    return pl.concat([
+        perspective('H', 'A', 'home', pl.col('Result')),
+        perspective('A', 'H', 'away', away_result)
+    ]).with_row_index('row')
+
+def window_mean(source, window, schema):
+    """
+    Mean of the previous `window` values in the row's segment, skipping
+    missing ones. Lags are summed in the same order as features.window_mean,
+    so both engines produce the same floats.
+    """
+    total = pl.lit(0.0)
+    count = pl.lit(0)
+    for k in range(1, window + 1):
+        lag = pl.when(pl.col('segment').shift(k) == pl.col('segment')).then(get_source(source, schema).shift(k))
+        total = total + lag.fill_null(0.0)
+        count = count + lag.is_not_null().cast(pl.Int64)
+    return pl.when(count > 0).then(total / count)
+
+def add_group_features(team_rows, group, features):
+    """
+    Sorts rows by group then Date so each group is a contiguous segment, and
+    computes the group's features with plain shifts masked at segment edges.
+    """
+    group = list(group)
+    team_rows = team_rows.sort(group + ['Date', 'row']).with_columns(pl.struct(group).rle_id().alias('segment'))
+    schema = team_rows.collect_schema()
+    return team_rows.with_columns([window_mean(feature.source, feature.window, schema).alias(feature.name) for feature in features])
+
+def add_features(team_rows, names=None):
+    """The requested registry features, one sorted pass per group."""
+    groups = {}
+    for feature in REGISTRY.resolve(names):
+        groups.setdefault(feature.group, []).append(feature)
+    for group, features in groups.items():
+        team_rows = add_group_features(team_rows, group, features)
+    return team_rows.drop('segment', strict=False)
+
+def process_data(frames, names=None):
+    """
+    Lazy equivalent of DataProcessor.process_data for the pandas engine,
+    returning the same columns in the same order.
+    """
+    team_rows = build_team_rows(parse_fixtures(to_lazy(frames)))
+    columns = team_rows.collect_schema().names()[1:] + [feature.name for feature in REGISTRY.resolve(names)]
+    team_rows = add_features(team_rows, names)
+    result = team_rows.sort(['Date', 'index', 'row']).select(columns).collect()
+    return result.to_pandas()
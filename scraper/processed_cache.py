@@ -0,0 +1,76 @@
+import hashlib
+import json
+import os
+import time
+import pandas as pd
+
+# Modules whose code decides what process_data produces
+FEATURE_CODE = ['parsing.py', 'processor.py', 'features.py', 'polars_engine.py', 'schema.py']
+
+def feature_code_version():
+    """Hash of the feature code, so editing a feature invalidates cached frames."""
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in FEATURE_CODE:
+        with open(os.path.join(directory, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+class ProcessedCache:
+    """
+    Processed team frames stored as Parquet, keyed by a hash of the raw
+    input, the feature code and the processor settings. A hit skips
+    processing entirely.
+    """
+    def __init__(self, directory='data/processed', max_entries=3):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'misses': 0, 'seconds_saved': 0.0}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_key(self, raw_fingerprint, processor):
+        parts = [raw_fingerprint, feature_code_version(), processor.engine, ','.join(processor.features)]
+        return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def get_path(self, key, extension):
+        return os.path.join(self.directory, f'{key}.{extension}')
+
+    def load(self, key):
+        start = time.perf_counter()
+        try:
+            with open(self.get_path(key, 'json')) as f:
+                meta = json.load(f)
+            df = pd.read_parquet(self.get_path(key, 'parquet'))
+        except (OSError, ValueError):
+            self.stats['misses'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        self.stats['seconds_saved'] += max(0.0, meta['seconds'] - (time.perf_counter() - start))
+        return df
+
+    def store(self, key, df, seconds):
+        path = self.get_path(key, 'parquet')
+        tmp_path = f'{path}.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+        # Written last: an entry only counts once its frame is complete
+        with open(self.get_path(key, 'json'), 'w') as f:
+            json.dump({'seconds': seconds, 'rows': len(df), 'created_at': time.time()}, f)
+        self.evict()
+
+    def evict(self):
+        """Keeps the newest max_entries frames."""
+        entries = [name[:-len('.json')] for name in os.listdir(self.directory) if name.endswith('.json')]
+        entries.sort(key=lambda key: os.path.getmtime(self.get_path(key, 'json')), reverse=True)
+        for key in entries[self.max_entries:]:
+            for extension in ('json', 'parquet'):
+                try:
+                    os.remove(self.get_path(key, extension))
+                except OSError:
+                    pass
+
+    def report(self):
+        stats = self.stats
+        print(f"Processed cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['seconds_saved']:.2f}s of processing saved")
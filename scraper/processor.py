@@ -1,83 +1,100 @@
-import pandas as pd
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from parsing import parse_scores
+from features import REGISTRY
+from schema import apply_schema, report_memory
+from validation import validate_frame
+
+ENGINES = ('pandas', 'polars')
 
 class DataProcessor:
-    def __init__(self):
-        pass
+    def __init__(self, engine='pandas', features=None):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+        self.engine = engine
+        # Subset of REGISTRY features to compute, all of them when None
+        self.features = [feature.name for feature in REGISTRY.resolve(features)]
     
     def sort_data(self, df):
+        """
+        Parses one raw frame into fixture columns. Only the needed columns
+        are taken from the raw frame, which is left untouched.
+        """
+        df = parse_scores(df[['Date', 'Day', 'Time', 'Home', 'Away', 'xG', 'xG.1', 'Score']].copy())
+        df['H.team'] = df['Home']
+        df['A.team'] = df['Away']
+        df['H.xg'] = pd.to_numeric(df['xG'], errors='coerce')
+        df['A.xg'] = pd.to_numeric(df['xG.1'], errors='coerce')
+        df['H.xga'] = df['A.xg']
+        df['A.xga'] = df['H.xg']
 
-            # print(df.head())
-
-            df['Status'] = df['Score'].apply(lambda x: 'no' if pd.isna(x) else 'yes')
-            df['H.team'] = df['Home']
-            df['A.team'] = df['Away']
-            df['H.xg'] = df['xG']
-            df['A.xg'] = df['xG.1']
-            df['H.xga'] = df['xG.1']
-            df['A.xga'] = df['xG']
-            # print(df['Score'].unique())
-            # print(df.loc[df['Score']=='Score'])
-            df['H.goals'] = df['Score'].apply(lambda x: None if pd.isna(x) else int(x.split('–')[0]) )
-            df['A.goals'] = df['Score'].apply(lambda x: None if pd.isna(x) else int(x.split('–')[1]) )
-            df['Result'] = df['Score'].apply(lambda x: None if pd.isna(x) else 3 if x.split('–')[0] > x.split('–')[1] else 1 if x.split('–')[0] == x.split('–')[1] else 0)
-            
-
-            features = ['Date', 'Day','Time', 'Result', 'H.team', 'A.team', 'H.xg', 'A.xg', 'H.xga', 'A.xga', 'H.goals', 'A.goals', 'Status']
+        features = ['Date', 'Day','Time', 'Result', 'H.team', 'A.team', 'H.xg', 'A.xg', 'H.xga', 'A.xga', 'H.goals', 'A.goals', 'Status']
 
-            return df[features]
+        return df[features]
 
+    def build_team_rows(self, df):
+        """
+        Parses raw fixtures into long-format team rows (without features):
+        one row per fixture from the home side's perspective and one from the
+        away side's, stacked from the same parsed columns.
+        Accepts one raw frame or an iterable of per-season frames; the
+        latter are parsed as they arrive and concatenated once.
+        """
+        if isinstance(df, pd.DataFrame):
+            df = self.sort_data(df)
+        else:
+            df = pd.concat([self.sort_data(frame) for frame in df])
+        df = df.dropna()
+        # Only played fixtures are left, so the parsed scores can be plain ints
+        df = df.astype({'H.goals': 'int64', 'A.goals': 'int64', 'Result': 'int64'})
+
+        def stack(home_col, away_col):
+            # Both perspectives, plus the same values swapped for the opponent side
+            home, away = df[home_col].to_numpy(), df[away_col].to_numpy()
+            return np.concatenate([home, away]), np.concatenate([away, home])
+
+        team, opponent = stack('H.team', 'A.team')
+        xg, xga = stack('H.xg', 'A.xg')
+        goals, opponent_goals = stack('H.goals', 'A.goals')
+        result = df['Result'].to_numpy()
+        away_result = np.where(result == 1, 1, 3 - result)
+
+        team_df = pd.DataFrame({
+            'index': np.tile(df.index.to_numpy(), 2),
+            'Team': team,
+            'Opponent': opponent,
+            'xg': xg,
+            'xga': xga,
+            'goals': goals,
+            'opponent_goals': opponent_goals,
+            'Date': np.tile(df['Date'].to_numpy(), 2),
+            'Status': np.tile(df['Status'].to_numpy(), 2),
+            'Result': np.concatenate([result, away_result]),
+            'location': np.repeat(['home', 'away'], len(df))
+        })
+        return team_df
 
     def process_data(self, df):
+        if self.engine == 'polars':
+            # Imported here so polars is only needed when it is selected
+            from polars_engine import process_data
+            team_df = apply_schema(process_data(df, self.features))
+            report_memory('processed', team_df)
+            return team_df
 
-        df = self.sort_data(df)
-        df.dropna(inplace=True)
-
-        # Rolling Averages
-        home_df = df[['H.team', 'A.team','H.xg', 'H.xga', 'H.goals', 'A.goals', 'Date',  'Status' ,'Result']].copy()
-        away_df = df[['A.team', 'H.team','A.xg', 'A.xga', 'A.goals', 'H.goals', 'Date', 'Status', 'Result']].copy()
-        away_df['Result_True'] = away_df['Result'].apply(lambda x: 3 if x ==0 else 0 if x==3 else 1)
-        away_df.drop(columns=['Result'], inplace=True)
-
-        home_df.columns = ['Team', 'Opponent', 'xg', 'xga', 'goals', 'opponent_goals', 'Date', 'Status', 'Result']
-        away_df.columns = ['Team', 'Opponent', 'xg', 'xga', 'goals', 'opponent_goals', 'Date', 'Status', 'Result']
-        home_df['location'] = 'home'
-        away_df['location'] = 'away'
-
-        both_df = pd.concat([home_df, away_df])
-        team_df = home_df.copy()
-
-        team_df = team_df.sort_values(['Team', 'Date'])
-        team_df = team_df.groupby('Team', group_keys=False).apply(lambda x: x)
-
-        team_df['rolling_xg'] = team_df['xg'].shift().rolling(window=5, min_periods=1).mean()
-        team_df['rolling_xga'] = team_df['xga'].shift().rolling(window=5, min_periods=1).mean()
+        team_df = self.build_team_rows(df)
+        report_memory('team rows', team_df)
 
-        # print(team_df.head())
+        # Every window is computed per team (or team and opponent/venue) over both home and away rows
+        team_df = REGISTRY.compute(team_df, self.features)
 
-        team_df['rolling_xg_diff'] = team_df.shift().apply(lambda row: row['xg'] - row['goals'], axis=1).rolling(window=5, min_periods=1).mean()
-        team_df['rolling_xga_diff'] = team_df.shift().apply(lambda row: row['xga'] - row['opponent_goals'], axis=1).rolling(window=5, min_periods=1).mean()
-
-        team_df['form_rolling_5'] = team_df['Result'].shift().rolling(window=5, min_periods=1).mean()
-        team_df['form_rolling_10'] = team_df['Result'].shift().rolling(window=10, min_periods=1).mean()
-
-        team_df['opponent_form_rolling_3'] = team_df['Result'].shift().rolling(window=3, min_periods=1).mean()
-        team_df['opponent_form_rolling_6'] = team_df['Result'].shift().rolling(window=6, min_periods=1).mean()
-
-        flat_df = both_df.copy()
-        flat_df = flat_df.sort_values(['Team', 'Opponent', 'location','Date'])
-        both_df = flat_df.groupby(['Team', 'Opponent', 'location'], 
-                            group_keys=False, 
-                            ).apply(lambda x: x)
-
-        both_df['opponent_home_form_rolling_2'] = both_df['Result'].shift().rolling(window=2, min_periods=1).mean()
-        both_df['opponent_away_form_rolling_2'] = both_df['Result'].shift().rolling(window=2, min_periods=1).mean()
-
-        team_df.reset_index( inplace=True)
-        team_df.sort_values(['Date', 'index'], inplace=True)
+        # Fixture order, home row before away row
+        team_df = team_df.sort_values(['Date', 'index'], kind='stable', ignore_index=True)
 
         team_df['Date'] = pd.to_datetime(team_df['Date'])
+        apply_schema(team_df)
+        report_memory('processed', team_df)
 
         print(team_df.head())
         print(team_df.columns)
@@ -85,14 +102,33 @@ class DataProcessor:
 
         return team_df
     
-    def validate_data(self, df):
+    def process_match_facts(self, df):
+        """
+        Team rows without features, for the database feature mode where
+        Postgres computes them (DatabaseHandler.refresh_features).
+        """
+        team_df = self.build_team_rows(df)
+        team_df = team_df.sort_values(['Date', 'index'], kind='stable', ignore_index=True)
+        team_df['Date'] = pd.to_datetime(team_df['Date'])
+        return apply_schema(team_df)
+
+    def process_new_results(self, df, state):
+        """
+        Computes feature rows for newly finished fixtures from a FeatureState
+        instead of replaying history, folding them into the state.
+        """
+        team_df = state.fold(self.build_team_rows(df))
+        team_df['Date'] = pd.to_datetime(team_df['Date'])
+        return apply_schema(team_df)
+
+    def validate_data(self, df, known_teams=None):
         """
-        Validates processed data before database insertion
+        Validates processed data before database insertion: dtypes, value
+        ranges, key uniqueness, null budgets and team names. Raises
+        ValueError with the report when any check fails.
         """
-        required_columns = ['Date', 'Result']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
-        if missing_columns:
-            raise ValueError(f"Missing required columns: {missing_columns}")
-            
-        return True
\ No newline at end of file
+        report = validate_frame(df, known_teams)
+        print(report.summary())
+        if not report.passed:
+            raise ValueError(report.summary())
+        return report
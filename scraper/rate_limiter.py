@@ -0,0 +1,78 @@
+from urllib.parse import urlparse
+import threading
+import time
+
+class TokenBucket:
+    """
+    Token bucket refilled at rate_per_minute, holding at most burst tokens.
+    """
+    def __init__(self, rate_per_minute, burst=1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.penalty = 0.0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, now):
+        """Takes a token, returning 0 on success or the seconds to wait."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        self.refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Shared, thread-safe limiter keeping one token bucket per host.
+    """
+    def __init__(self, requests_per_minute=10, burst=1, base_backoff=60, max_backoff=600):
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def get_bucket(self, url):
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.requests_per_minute, self.burst)
+        return self.buckets[host]
+
+    def acquire(self, url):
+        while True:
+            with self.lock:
+                wait = self.get_bucket(url).try_acquire(time.monotonic())
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def backoff(self, url, retry_after=None):
+        """
+        Pauses the host after a 429, honouring Retry-After when given and
+        otherwise doubling the pause on each consecutive rate limit.
+        """
+        with self.lock:
+            bucket = self.get_bucket(url)
+            if retry_after is not None:
+                delay = retry_after
+            else:
+                bucket.penalty = min(self.max_backoff, bucket.penalty * 2 or self.base_backoff)
+                delay = bucket.penalty
+            now = time.monotonic()
+            bucket.blocked_until = max(bucket.blocked_until, now + delay)
+            bucket.tokens = 0.0
+            bucket.updated = now + delay
+        print(f"Rate limited by {urlparse(url).netloc}, pausing {delay:.0f} seconds")
+
+    def success(self, url):
+        with self.lock:
+            self.get_bucket(url).penalty = 0.0
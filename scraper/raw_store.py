@@ -0,0 +1,156 @@
+import hashlib
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+TEAM_TYPE = pa.dictionary(pa.int16(), pa.string())
+
+# Columns of the fbref fixtures table; anything else scraped is dropped
+RAW_SCHEMA = pa.schema([
+    ('Wk', pa.int16()),
+    ('Day', pa.string()),
+    ('Date', pa.date32()),
+    ('Time', pa.string()),
+    ('Home', TEAM_TYPE),
+    ('xG', pa.float32()),
+    ('Score', pa.string()),
+    ('xG.1', pa.float32()),
+    ('Away', TEAM_TYPE),
+    ('Attendance', pa.float32()),
+    ('Venue', pa.string()),
+    ('Referee', pa.string()),
+    ('Match Report', pa.string()),
+    ('Notes', pa.string())
+])
+
+PARTITIONING = ds.partitioning(pa.schema([('season', pa.int16())]), flavor='hive')
+
+class RawStore:
+    """
+    Raw scraped fixtures stored as one typed Parquet partition per season.
+    Each partition is written atomically, so a season that is present is
+    complete and a failed season can be re-scraped on its own.
+    """
+    def __init__(self, directory='data/raw'):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_path(self, season):
+        return os.path.join(self.directory, f'season={season}', 'part-0.parquet')
+
+    def seasons(self):
+        seasons = []
+        for name in os.listdir(self.directory):
+            if name.startswith('season=') and os.path.exists(os.path.join(self.directory, name, 'part-0.parquet')):
+                seasons.append(int(name.split('=')[1]))
+        return sorted(seasons)
+
+    def fingerprint(self, seasons=None):
+        """Hash of the stored partitions; writes are deterministic, so unchanged data hashes the same."""
+        digest = hashlib.sha256()
+        for season in seasons if seasons is not None else self.seasons():
+            path = self.get_path(season)
+            if os.path.exists(path):
+                digest.update(f'season={season}\n'.encode('utf-8'))
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+
+    def to_table(self, df):
+        """Coerces a scraped frame to RAW_SCHEMA."""
+        data = {}
+        for field in RAW_SCHEMA:
+            col = df[field.name] if field.name in df.columns else pd.Series([None] * len(df), index=df.index)
+            if field.name == 'Date':
+                col = pd.to_datetime(col, errors='coerce').dt.date
+            elif pa.types.is_integer(field.type) or pa.types.is_floating(field.type):
+                col = pd.to_numeric(col, errors='coerce')
+            else:
+                col = col.astype(object).where(col.notna(), None)
+                col = col.map(lambda value: value if value is None else str(value))
+            data[field.name] = pa.array(col, type=field.type, from_pandas=True)
+        return pa.table(data, schema=RAW_SCHEMA)
+
+    def to_frame(self, df, season):
+        """A scraped frame as read() returns it once stored."""
+        return self.to_table(df).to_pandas(date_as_object=False).assign(season=np.int16(season))
+
+    def write_season(self, df, season):
+        path = self.get_path(season)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        pq.write_table(self.to_table(df), tmp_path)
+        os.replace(tmp_path, path)
+        print(f"Stored {len(df)} raw rows for season {season}")
+
+    def write(self, df):
+        for season, season_df in df.groupby('season'):
+            self.write_season(season_df, season)
+
+    def write_stream(self, frames):
+        """Checkpoints each per-season frame as it arrives."""
+        seasons = []
+        for df in frames:
+            seasons.append(df['season'].iloc[0])
+            self.write_season(df, seasons[-1])
+        return seasons
+
+    def is_complete(self, season):
+        """True once every stored fixture of the season has a score, i.e. it was scraped after the last matchday."""
+        scores = self.read(seasons=[season], columns=['Score'])['Score']
+        return len(scores) > 0 and scores.notna().all()
+
+    def staging(self):
+        """
+        An empty sibling store. Seasons are scraped into it and only moved
+        into this store by commit() once they reached the database.
+        """
+        staging = RawStore(f'{os.path.normpath(self.directory)}.staging')
+        for season in staging.seasons():
+            os.remove(staging.get_path(season))
+        return staging
+
+    def link_missing(self, store, seasons=None):
+        """Adds the given seasons this store lacks from `store`, as hard links where possible."""
+        for season in seasons if seasons is not None else store.seasons():
+            source, path = store.get_path(season), self.get_path(season)
+            if os.path.exists(path) or not os.path.exists(source):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                os.link(source, path)
+            except OSError:
+                shutil.copyfile(source, path)
+
+    def commit(self, staging):
+        """Moves every staged partition into this store, each with an atomic rename."""
+        seasons = staging.seasons()
+        for season in seasons:
+            path = self.get_path(season)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(staging.get_path(season), path)
+        print(f"Committed raw seasons {seasons}")
+
+    def iter_seasons(self, seasons=None, columns=None):
+        for season in seasons if seasons is not None else self.seasons():
+            yield self.read(seasons=[season], columns=columns)
+
+    def read(self, seasons=None, columns=None, filter=None):
+        """
+        Reads the selected seasons and columns; seasons and any extra
+        pyarrow filter expression are pushed down to the Parquet scan.
+        """
+        dataset = ds.dataset(self.directory, format='parquet', partitioning=PARTITIONING)
+        if seasons is not None:
+            season_filter = ds.field('season').isin(list(seasons))
+            filter = season_filter if filter is None else season_filter & filter
+        table = dataset.to_table(columns=columns, filter=filter)
+        return table.to_pandas(date_as_object=False)
+
+    def import_csv(self, path):
+        """One-off migration from the old data/raw_data.csv file."""
+        self.write(pd.read_csv(path, index_col=0))
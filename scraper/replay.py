@@ -0,0 +1,224 @@
+"""
+Offline replay harness for MatchScraper.
+
+Schedule pages are recorded to disk once and then served back either by a
+local HTTP stand-in (for the HTTP path) or by FakeDriver (for the Chrome
+path), so the scraper can be exercised and benchmarked with no network.
+
+    python replay.py record --seasons 22 23 24 --out data/replay
+    python replay.py synthesize --seasons 17 18 19 --out data/replay
+"""
+import argparse
+import json
+import os
+import threading
+from datetime import date, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+import numpy as np
+from lxml import html as lxml_html
+from lxml import etree
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+from scraper import MatchScraper
+
+MANIFEST = 'manifest.json'
+
+class PageArchive:
+    """
+    Directory of recorded pages plus a manifest mapping URL paths to files.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(os.path.join(self.directory, MANIFEST)) as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def save(self, url, body):
+        path = urlparse(url).path
+        filename = f'{len(self.manifest):04d}.html' if path not in self.manifest else self.manifest[path]
+        with open(os.path.join(self.directory, filename), 'w', encoding='utf-8') as f:
+            f.write(body)
+        self.manifest[path] = filename
+        with open(os.path.join(self.directory, MANIFEST), 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def load(self, url):
+        filename = self.manifest.get(urlparse(url).path)
+        if filename is None:
+            return None
+        with open(os.path.join(self.directory, filename), encoding='utf-8') as f:
+            return f.read()
+
+    def pages(self):
+        return [self.load(path) for path in self.manifest]
+
+
+def record_pages(seasons, directory):
+    """Fetches each season's schedule page once and stores it in the archive."""
+    archive = PageArchive(directory)
+    scraper = MatchScraper(seasons)
+    for season in seasons:
+        url = scraper.get_url(season)
+        print(f"Recording {url}")
+        archive.save(url, scraper.fetcher.fetch(url))
+    return archive
+
+
+class ReplayServer:
+    """
+    Serves an archive over HTTP on localhost. Use as a context manager and
+    point MatchScraper at server.base_url.
+    """
+    def __init__(self, archive, base_path='/en/comps/9/'):
+        self.archive = archive
+        self.base_path = base_path
+        archive_ref = archive
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                body = archive_ref.load(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}{self.base_path}'
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.server.shutdown()
+        self.server.server_close()
+        return False
+
+
+class FakeElement:
+    def __init__(self, element):
+        self.element = element
+
+    def get_attribute(self, name):
+        if name == 'outerHTML':
+            return etree.tostring(self.element, encoding='unicode')
+        return self.element.get(name)
+
+
+class FakeDriver:
+    """
+    Stands in for webdriver.Chrome, answering the calls MatchScraper makes
+    from an archive instead of a browser.
+    """
+    def __init__(self, archive):
+        self.archive = archive
+        self.tree = None
+
+    def get(self, url):
+        body = self.archive.load(url)
+        self.tree = lxml_html.fromstring(body if body is not None else '<html></html>')
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f'{by}={value}')
+        return elements[0]
+
+    def find_elements(self, by, value):
+        if by == By.ID:
+            elements = self.tree.xpath('//*[@id=$value]', value=value)
+        elif by == By.TAG_NAME:
+            elements = self.tree.xpath(f'//{value}')
+        else:
+            raise InvalidSelectorException(f'FakeDriver does not support {by}')
+        return [FakeElement(element) for element in elements]
+
+    def execute_cdp_cmd(self, cmd, params):
+        return {}
+
+    def quit(self):
+        self.tree = None
+
+
+def make_schedule_page(season, teams=20, header_every=10, seed=0, unplayed=0.1):
+    """
+    Builds an fbref-style schedule page for one season: decoy tables first,
+    then the fixtures table with repeated header rows and unplayed games.
+    """
+    rng = np.random.default_rng(seed + season)
+    names = [f'Team {i:02d}' for i in range(teams)]
+    columns = ['Wk', 'Day', 'Date', 'Time', 'Home', 'xG', 'Score', 'xG', 'Away',
+               'Attendance', 'Venue', 'Referee', 'Match Report', 'Notes']
+    header = '<tr>' + ''.join(f'<th>{col}</th>' for col in columns) + '</tr>'
+
+    rows = []
+    fixtures = [(home, away) for home in names for away in names if home != away]
+    for i, (home, away) in enumerate(fixtures):
+        if i and i % header_every == 0:
+            rows.append(header.replace('<tr>', '<tr class="thead">'))
+        match_date = date(2000 + season, 8, 10) + timedelta(days=7 * (i // header_every) + i % 3)
+        played = i < len(fixtures) * (1 - unplayed)
+        score = f'{rng.integers(0, 5)}&ndash;{rng.integers(0, 5)}' if played else ''
+        home_xg = f'{rng.uniform(0, 3):.1f}' if played else ''
+        away_xg = f'{rng.uniform(0, 3):.1f}' if played else ''
+        values = [i // header_every + 1, 'Sat', match_date.isoformat(), '15:00',
+                  home, home_xg, score, away_xg, away, '30000', 'Stadium', 'Referee', 'Match Report', '']
+        rows.append('<tr>' + ''.join(f'<td>{value}</td>' for value in values) + '</tr>')
+
+    table_id = f'sched_20{season}-20{season+1}_9_1'
+    decoys = ''.join(f'<table id="decoy_{i}"><tr><td>{i}</td></tr></table>' for i in range(9))
+    return (f'<html><head><title>20{season}-20{season+1} Scores &amp; Fixtures</title></head><body>{decoys}'
+            f'<table id="{table_id}"><thead>{header}</thead><tbody>{"".join(rows)}</tbody></table>'
+            f'</body></html>')
+
+
+def synthesize_pages(seasons, directory):
+    archive = PageArchive(directory)
+    scraper = MatchScraper(seasons)
+    for season in seasons:
+        archive.save(scraper.get_url(season), make_schedule_page(season))
+    return archive
+
+
+def replay_scraper(seasons, archive, server=None, **kwargs):
+    """
+    Builds a MatchScraper wired to the archive: HTTP requests go to server
+    when one is given, and the Chrome fallback always uses FakeDriver.
+    """
+    kwargs.setdefault('requests_per_minute', 1e6)
+    kwargs.setdefault('page_timeout', 1)
+    if server is not None:
+        kwargs['base_url'] = server.base_url
+    else:
+        kwargs['use_http'] = False
+    return MatchScraper(seasons, driver_factory=lambda: FakeDriver(archive), **kwargs)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('command', choices=['record', 'synthesize'])
+    parser.add_argument('--seasons', type=int, nargs='+', required=True)
+    parser.add_argument('--out', default='data/replay')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record_pages(args.seasons, args.out)
+    else:
+        synthesize_pages(args.seasons, args.out)
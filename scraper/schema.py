@@ -0,0 +1,41 @@
+import numpy as np
+
+# Compact dtypes for the long-format team frame. Feature columns stay
+# float64: they are computed averages and are written to the database as is.
+TEAM_FRAME_DTYPES = {
+    'index': 'int32',
+    'Team': 'category',
+    'Opponent': 'category',
+    'xg': 'float32',
+    'xga': 'float32',
+    'goals': 'int8',
+    'opponent_goals': 'int8',
+    'Status': 'category',
+    'Result': 'int8',
+    'location': 'category'
+}
+
+# float32 keeps about 7 significant digits; rounding when widening back to
+# float64 recovers the scraped decimals (xG has one or two)
+FLOAT32_DECIMALS = 6
+
+def apply_schema(df, dtypes=TEAM_FRAME_DTYPES):
+    """Casts the columns df has to their compact dtypes, column by column in place."""
+    for col, dtype in dtypes.items():
+        if col in df.columns and df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+def widen_floats(df):
+    """float64 copy of numeric columns, with float32 values rounded back to their decimals."""
+    wide = df.astype('float64')
+    for col in df.columns:
+        if df[col].dtype == np.float32:
+            wide[col] = wide[col].round(FLOAT32_DECIMALS)
+    return wide
+
+def memory_mb(df):
+    return df.memory_usage(deep=True).sum() / 2 ** 20
+
+def report_memory(stage, df):
+    print(f"Memory [{stage}]: {len(df)} rows, {memory_mb(df):.2f} MB")
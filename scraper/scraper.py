@@ -1,14 +1,44 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 import pandas as pd
+import requests
 import time
-import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from io import StringIO
+from driver_session import DriverSession
+from http_fetcher import HttpFetcher, find_table_html
+from parsing import drop_header_rows
+from rate_limiter import RateLimiter
+from page_cache import PageCache
+from datetime import date
+
+# Requests the fixtures table never needs: static assets plus ad/analytics hosts
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.css',
+    '*googletagmanager.com*', '*google-analytics.com*', '*doubleclick.net*',
+    '*googlesyndication.com*', '*amazon-adsystem.com*', '*adnxs.com*',
+    '*quantserve.com*', '*scorecardresearch.com*', '*facebook.net*'
+]
 
 class MatchScraper:
-    def __init__(self, seasons):
-        self.base_url = 'https://fbref.com/en/comps/9/'
+    def __init__(self, seasons, max_pages_per_driver=20, block_resources=True, page_timeout=20, use_http=True,
+                 requests_per_minute=10, max_workers=1, cache_dir=None, cache_ttl=6 * 3600,
+                 base_url='https://fbref.com/en/comps/9/', driver_factory=None):
+        self.base_url = base_url
         self.seasons = seasons
+        self.use_http = use_http
+        self.max_workers = max_workers
+
+        # Shared across workers so the per-host request budget holds globally
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.block_resources = block_resources
+        self.page_timeout = page_timeout
 
         # Configure Chrome options
         self.chrome_options = Options()
@@ -22,86 +52,185 @@ class MatchScraper:
         user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         self.chrome_options.add_argument(f'user-agent={user_agent}')
 
+        if self.block_resources:
+            # The table is in the initial HTML, so don't wait for subresources
+            self.chrome_options.page_load_strategy = 'eager'
+            self.chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            self.chrome_options.add_experimental_option('prefs', {
+                'profile.managed_default_content_settings.images': 2,
+                'profile.managed_default_content_settings.fonts': 2
+            })
+
+        # Plain HTTP is tried first; Chrome is only started if that fails
+        self.cache = PageCache(cache_dir, cache_ttl) if cache_dir else None
+        self.fetcher = HttpFetcher(pool_size=max(4, max_workers), rate_limiter=self.rate_limiter, cache=self.cache)
+
+        # One Chrome instance shared by every season, recycled periodically
+        self.driver_session = DriverSession(
+            self.chrome_options,
+            max_pages=max_pages_per_driver,
+            driver_factory=driver_factory,
+            on_start=self.configure_driver if self.block_resources else None
+        )
+        self.driver_lock = threading.Lock()
+
     def get_url(self, season):
         return f'{self.base_url}20{season}-20{season+1}/schedule/20{season}-20{season+1}-Premier-League-Scores-and-Fixtures'
 
+    def is_season_complete(self, season):
+        # A season's fixture page stops changing once the summer break starts
+        return date.today() >= date(2000 + season + 1, 6, 1)
+
+    def get_table_id(self, season):
+        return f'sched_20{season}-20{season+1}_9_1'
+
+    def configure_driver(self, driver):
+        # Block assets and trackers at the network layer for every page load
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS})
+
+    def read_fixtures_table(self, driver, table_id):
+        # Wait for the fixtures table itself rather than a fixed delay
+        print(f"Waiting for table {table_id}...")
+        try:
+            target_table = WebDriverWait(driver, self.page_timeout).until(
+                EC.presence_of_element_located((By.ID, table_id))
+            )
+        except TimeoutException:
+            print(f"Table {table_id} not found after {self.page_timeout} seconds")
+            return None
+        print("Found target table!")
+        
+        # Get table HTML
+        table_html = target_table.get_attribute('outerHTML')
+        return self.parse_table(table_html)
+
+    def parse_table(self, table_html):
+        # Convert to DataFrame
+        df = pd.read_html(StringIO(table_html))[0]
+        df = drop_header_rows(df)
+        # print(f"Table shape: {df.shape}")
+        # print("Columns:", list(df.columns))
+        
+        return df
+
+    def parse_page(self, page_html, season):
+        """
+        Extracts the season's fixtures table from a full schedule page.
+        Works on saved pages as well as live responses.
+        """
+        table_html = find_table_html(page_html, self.get_table_id(season))
+        if table_html is None:
+            print(f"Table {self.get_table_id(season)} not found in page")
+            return None
+        return self.parse_table(table_html)
+
+    def scrape_http(self, url, season):
+        try:
+            start = time.perf_counter()
+            page_html = self.fetcher.fetch(url, immutable=self.is_season_complete(season))
+            df = self.parse_page(page_html, season)
+            if df is None and self.cache is not None:
+                # Don't keep serving a page the table couldn't be found in
+                self.cache.invalidate(url)
+            elif self.cache is not None and df['Score'].isna().any() and self.is_season_complete(season):
+                # Still being played past the usual end (2019-20 ran into July), so not final yet
+                self.cache.invalidate(url)
+            print(f"Fetched season {season} over HTTP in {time.perf_counter() - start:.2f}s")
+            return df
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 429:
+                # Still rate limited after every retry; Chrome would hit the same host
+                raise
+            print(f"HTTP fetch failed: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"HTTP fetch failed: {str(e)}")
+            return None
+
     def scrape_website(self, season):
         try:
             print(f"Scraping season {season}...")
-            driver = webdriver.Chrome(options=self.chrome_options)
-            
-            try:
-                url = self.get_url(season)
-                print(f"Accessing URL: {url}")
-                driver.get(url)
-                
-                # Wait for tables to load
-                print("Waiting for page to load...")
-                time.sleep(5)  # Allow JavaScript to render
-                
-                # Find all tables
-                tables = driver.find_elements(By.TAG_NAME, "table")
-                print(f"Found {len(tables)} tables")
-                
-                if len(tables) >= 10:
-                    target_table = tables[9]  # Index 9 for the 10th table
-                    print("Found target table!")
-                    
-                    # Get table HTML
-                    table_html = target_table.get_attribute('outerHTML')
-                    
-                    # Convert to DataFrame
-                    df = pd.read_html(table_html)[0]
-
-                    header_values = list(df.columns)
-                    df = df[~df.apply(lambda row: all(str(val) in header_values for val in row), axis=1)]
-                    # print(f"Table shape: {df.shape}")
-                    # print("Columns:", list(df.columns))
-                    
+            url = self.get_url(season)
+            table_id = self.get_table_id(season)
+            print(f"Accessing URL: {url}")
+
+            if self.use_http:
+                df = self.scrape_http(url, season)
+                if df is not None:
                     return df
-                else:
-                    print(f"Not enough tables found. Only found {len(tables)} tables.")
-                    return None
-                    
-            except Exception as e:
-                print(f"Error processing page: {str(e)}")
-                return None
-            finally:
-                driver.quit()
+                print("Falling back to Chrome...")
+
+            # The Chrome session is shared, so workers take turns with it
+            with self.driver_lock:
+                self.rate_limiter.acquire(url)
+                return self.driver_session.load_page(
+                    url, lambda driver: self.read_fixtures_table(driver, table_id)
+                )
                 
         except Exception as e:
-            print(f"Error initializing driver: {str(e)}")
+            print(f"Error processing page: {str(e)}")
             return None
 
-    def get_tables(self):
-        print("Starting to get tables...")
-        df = None
+    def scrape_season(self, season):
+        try:
+            df = self.scrape_website(season)
+            if df is None:
+                print(f"Skipping season {season} due to scraping error")
+                return None
 
-        for season in self.seasons:
-            try:
-                df_temp = self.scrape_website(season)
-                if df_temp is None:
-                    print(f"Skipping season {season} due to scraping error")
-                    continue
+            df['season'] = season
+            print(f"Successfully processed season {season}")
+            return df
 
-                df_temp['season'] = season
-                print(f"Successfully processed season {season}")
+        except Exception as e:
+            print(f"Error processing season {season}: {str(e)}")
+            return None
 
-                if df is None:
-                    df = df_temp
-                else:
-                    df = pd.concat([df, df_temp])
+    def iter_season_frames(self):
+        if self.max_workers > 1:
+            # Requests are paced by the rate limiter, not by the worker count
+            # Only max_workers seasons are in flight or waiting to be consumed,
+            # and each future is dropped once its frame is yielded
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                seasons = iter(self.seasons)
+                pending = set()
+                while True:
+                    for season in islice(seasons, self.max_workers - len(pending)):
+                        pending.add(pool.submit(self.scrape_season, season))
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    while done:
+                        yield done.pop().result()
+        else:
+            for season in self.seasons:
+                yield self.scrape_season(season)
+
+    def iter_tables(self):
+        """
+        Yields one frame per successfully scraped season as soon as it is
+        ready, so consumers never need more than a season in memory.
+        """
+        print("Starting to get tables...")
+        start = time.perf_counter()
+        scraped = 0
 
-                # Add delay between seasons
-                delay = random.uniform(0, 1)
-                print(f"Waiting {delay:.2f} seconds before next season...")
-                time.sleep(delay)
+        with self.driver_session:
+            for df in self.iter_season_frames():
+                if df is None:
+                    continue
+                scraped += 1
+                yield df
 
-            except Exception as e:
-                print(f"Error processing season {season}: {str(e)}")
-                continue
+            self.driver_session.report_timings()
+            if self.cache is not None:
+                self.cache.report()
 
-        if df is None:
+        if scraped == 0:
             raise Exception("Failed to retrieve any data from all seasons")
 
-        return df
\ No newline at end of file
+        print(f"Scraped {scraped} seasons in {time.perf_counter() - start:.2f} seconds")
+
+    def get_tables(self):
+        return pd.concat(list(self.iter_tables()))
@@ -0,0 +1,64 @@
+import pandas as pd
+from sqlalchemy import text
+
+# Database URL -> {team_name: team_id}. Team ids are never reassigned, so the
+# cache lives for the whole process and is shared by every handler and run.
+TEAM_ID_CACHE = {}
+
+def clear_team_cache():
+    """Forgets every cached id, e.g. after the teams table was recreated."""
+    TEAM_ID_CACHE.clear()
+
+class TeamResolver:
+    """
+    Maps team names to teams.team_id. Names missing from the cache are
+    upserted and read back in one statement; known names never touch the
+    database.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.ids = TEAM_ID_CACHE.setdefault(str(engine.url), {})
+
+    def load_names(self):
+        """Every stored team name. Fills the cache too, so these names skip the upsert later."""
+        with self.engine.connect() as conn:
+            result = conn.execute(text("SELECT team_id, team_name FROM teams"))
+            self.ids.update({row.team_name: row.team_id for row in result})
+        return set(self.ids)
+
+    def resolve(self, names):
+        """Makes sure every name has an id, inserting the new ones. Returns the names left without one."""
+        missing = sorted({str(name) for name in names if pd.notna(name)} - self.ids.keys())
+        if not missing:
+            return []
+
+        # Existing names come from the statement's snapshot, new ones from
+        # RETURNING; a name inserted concurrently by another writer is in
+        # neither, so it is picked up by a second pass
+        for _ in range(2):
+            with self.engine.begin() as conn:
+                result = conn.execute(text("""
+                    WITH names AS (
+                        SELECT DISTINCT unnest(CAST(:names AS varchar[])) AS team_name
+                    ),
+                    inserted AS (
+                        INSERT INTO teams (team_name)
+                        SELECT team_name FROM names
+                        ON CONFLICT (team_name) DO NOTHING
+                        RETURNING team_id, team_name
+                    )
+                    SELECT team_id, team_name FROM inserted
+                    UNION ALL
+                    SELECT t.team_id, t.team_name FROM teams t JOIN names n USING (team_name)
+                """), {'names': missing})
+                self.ids.update({row.team_name: row.team_id for row in result})
+            missing = [name for name in missing if name not in self.ids]
+            if not missing:
+                break
+        return missing
+
+    def map_ids(self, col):
+        """Nullable team ids for a name column, looked up once per category rather than per row."""
+        col = col if isinstance(col.dtype, pd.CategoricalDtype) else col.astype('category')
+        ids = pd.array([self.ids.get(str(name)) for name in col.cat.categories], dtype='Int64')
+        return pd.Series(ids.take(col.cat.codes.to_numpy(), allow_fill=True), index=col.index)
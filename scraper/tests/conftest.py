@@ -0,0 +1,40 @@
+import os
+import sys
+import pandas as pd
+import pytest
+import requests
+
+# The scraper modules import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import synthesize_pages, replay_scraper
+
+SEASONS = [22, 23]
+
+def make_response(status_code, body='', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body.encode('utf-8')
+    response.headers.update(headers or {})
+    return response
+
+class FakeSession:
+    """Answers session.get from a list of responses and records the request headers."""
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+@pytest.fixture(scope='session')
+def archive(tmp_path_factory):
+    """Synthetic fbref schedule pages for SEASONS."""
+    return synthesize_pages(SEASONS, str(tmp_path_factory.mktemp('replay')))
+
+@pytest.fixture(scope='session')
+def raw_data(archive):
+    """Raw fixtures for SEASONS as the scraper returns them, replayed through FakeDriver."""
+    scraper = replay_scraper(SEASONS, archive)
+    return pd.concat([scraper.scrape_season(season) for season in SEASONS], ignore_index=True)
@@ -0,0 +1,41 @@
+import pytest
+import database_handler
+from database_handler import DatabaseHandler
+from processor import DataProcessor
+
+class FakeEngine:
+    """Records transactions instead of opening them."""
+    url = 'postgresql://scratch'
+
+    def __init__(self):
+        self.transactions = 0
+
+    def begin(self):
+        self.transactions += 1
+        raise RuntimeError("no database in tests")
+
+class FakeResolver:
+    def __init__(self):
+        self.ids = {}
+
+    def resolve(self, names):
+        return []
+
+    def map_ids(self, col):
+        return col.map(self.ids).astype('Int64')
+
+@pytest.fixture
+def handler(raw_data, monkeypatch):
+    monkeypatch.setattr(DatabaseHandler, 'create_connection', lambda self: FakeEngine())
+    monkeypatch.setattr(database_handler, 'TeamResolver', lambda engine: FakeResolver())
+    return DatabaseHandler({}, DataProcessor().process_data(raw_data))
+
+def test_unresolved_teams_stop_the_load(handler, monkeypatch):
+    monkeypatch.setattr(handler.teams, 'resolve', lambda names: ['Team 00'])
+    assert handler.insert_data_safe() is False
+    assert handler.engine.transactions == 0
+
+def test_rows_without_team_ids_stop_the_load(handler):
+    handler.teams.ids = {name: i for i, name in enumerate(handler.df['Team'].cat.categories) if name != 'Team 05'}
+    assert handler.insert_data_safe() is False
+    assert handler.engine.transactions == 0
@@ -0,0 +1,18 @@
+import numpy as np
+from features import HEAD_TO_HEAD_FEATURES
+from head_to_head import HeadToHeadIndex
+from processor import DataProcessor
+
+def test_lookup_matches_compute(raw_data):
+    team_df = DataProcessor().build_team_rows(raw_data)
+    index = HeadToHeadIndex(team_df)
+    computed = index.compute()
+
+    # lookup() sees only earlier days, so skip teams with two fixtures on one day
+    single = ~team_df.duplicated(['Team', 'Date'], keep=False)
+    rows = team_df[single.values].iloc[::25]
+    assert len(rows) > 10
+    for position, row in rows.iterrows():
+        values = index.lookup(row['Team'], row['Opponent'], row['location'], row['Date'])
+        for name in HEAD_TO_HEAD_FEATURES:
+            np.testing.assert_equal(values[name], computed.loc[position, name], err_msg=name)
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+from feature_state import FeatureState
+from features import REGISTRY
+from incremental import find_changed_fixtures, select_update_batch
+from processor import DataProcessor
+
+def rescore(raw_data, rows, score):
+    scraped = raw_data.copy()
+    scraped.loc[rows, ['Score', 'xG', 'xG.1']] = [score, '0.2', '2.9']
+    return scraped
+
+def assert_matches_full_recompute(scraped, changed):
+    batch, cutoff, teams = select_update_batch(scraped, changed)
+    processed = DataProcessor().process_data(batch)
+    incremental = processed[(processed['Date'] >= pd.Timestamp(cutoff)) & processed['Team'].isin(teams)]
+
+    full = DataProcessor().process_data(scraped)
+    key = ['Date', 'Team', 'Opponent']
+    merged = incremental.astype({'Team': str, 'Opponent': str}).merge(
+        full.astype({'Team': str, 'Opponent': str}), on=key, suffixes=('', '_full'))
+    expected = full[(full['Date'] >= pd.Timestamp(cutoff)) & full['Team'].isin(teams)]
+    assert len(merged) == len(incremental) == len(expected)
+    for name in REGISTRY.names():
+        np.testing.assert_array_equal(merged[name], merged[f'{name}_full'], err_msg=name)
+
+@pytest.mark.parametrize('offsets', [[-40], [-200, -45], [-390]])
+def test_update_batch_matches_full_recompute(raw_data, offsets):
+    played = raw_data.index[raw_data['Score'].notna()]
+    scraped = rescore(raw_data, played[offsets], '0–3')
+    changed = find_changed_fixtures(raw_data, scraped)
+    assert len(changed) == len(offsets)
+    assert_matches_full_recompute(scraped, changed)
+
+def test_update_batch_keeps_head_to_head_history(raw_data):
+    # The last meeting of a pair is a season before, far beyond each team's last 10 games
+    played = raw_data[raw_data['Score'].notna()]
+    last = played.index[-1]
+    home, away = raw_data.loc[last, ['Home', 'Away']]
+    earlier = played[(played['Home'] == home) & (played['Away'] == away) & (played.index < last)]
+    assert not earlier.empty
+
+    scraped = rescore(raw_data, [last], '0–3')
+    batch, _, _ = select_update_batch(scraped, scraped.loc[[last]])
+    assert set(earlier['Date']) <= set(batch['Date'][(batch['Home'] == home) & (batch['Away'] == away)])
+    assert_matches_full_recompute(scraped, scraped.loc[[last]])
+
+def test_state_reload_keeps_older_contexts(raw_data):
+    processed = DataProcessor().process_data(raw_data)
+    state = FeatureState().load_frame(processed)
+    before = state.to_dict()
+
+    # A batch without any meeting between the team and one opponent
+    team, opponent = processed[['Team', 'Opponent']].iloc[-1]
+    batch = processed[(processed['Team'] == team) & (processed['Opponent'] != opponent)]
+    state.load_frame(batch, {team})
+
+    contexts = state.to_dict()[team]['contexts']
+    kept = [key for key in before[team]['contexts'] if f'Opponent={opponent}' in key]
+    assert kept and all(contexts[key] == before[team]['contexts'][key] for key in kept)
+
+def test_state_reload_matches_full_rebuild(raw_data):
+    played = raw_data.index[raw_data['Score'].notna()]
+    scraped = rescore(raw_data, played[[-40]], '0–3')
+    changed = find_changed_fixtures(raw_data, scraped)
+
+    state = FeatureState().load_frame(DataProcessor().process_data(raw_data))
+    batch, _, teams = select_update_batch(scraped, changed)
+    state.load_frame(DataProcessor().process_data(batch), teams)
+
+    expected = FeatureState().load_frame(DataProcessor().process_data(scraped))
+    assert state.to_dict() == expected.to_dict()
+
+def one_fixture_per_team_and_day(raw_data):
+    """Drops fixtures until no team plays twice on a day, the order fold() cannot tell apart."""
+    seen, keep = set(), []
+    for position, (day, home, away) in enumerate(zip(raw_data['Date'], raw_data['Home'], raw_data['Away'])):
+        if (day, home) not in seen and (day, away) not in seen:
+            seen.update({(day, home), (day, away)})
+            keep.append(position)
+    return raw_data.iloc[keep]
+
+def test_fold_matches_full_recompute(raw_data):
+    raw_data = one_fixture_per_team_and_day(raw_data)
+    played = raw_data[raw_data['Score'].notna()]
+    cutoff = played['Date'].iloc[-60]
+    earlier, later = raw_data[raw_data['Date'] < cutoff], played[played['Date'] >= cutoff]
+
+    processor = DataProcessor()
+    state = FeatureState().load_frame(processor.process_data(earlier))
+    assert state.can_fold(processor.build_team_rows(later))
+    folded = processor.process_new_results(later, state)
+
+    full = processor.process_data(raw_data)
+    key = ['Date', 'Team', 'Opponent']
+    merged = folded.astype({'Team': str, 'Opponent': str}).merge(
+        full.astype({'Team': str, 'Opponent': str}), on=key, suffixes=('', '_full'))
+    assert len(merged) == len(folded) == 2 * len(later)
+    for name in REGISTRY.names():
+        np.testing.assert_allclose(merged[name], merged[f'{name}_full'], rtol=0, atol=1e-12, err_msg=name)
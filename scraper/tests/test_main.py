@@ -0,0 +1,67 @@
+import pytest
+import main
+from replay import make_schedule_page, replay_scraper, synthesize_pages
+from conftest import SEASONS
+
+class FakeResolver:
+    """An empty teams table."""
+    def __init__(self, engine):
+        self.engine = engine
+
+    def load_names(self):
+        return set()
+
+@pytest.fixture
+def config(tmp_path, monkeypatch, archive):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'MatchScraper', lambda seasons, **kwargs: replay_scraper(seasons, archive))
+    monkeypatch.setattr(main, 'TeamResolver', FakeResolver)
+    monkeypatch.setattr(main, 'get_engine', lambda db_config: None)
+    return {
+        'seasons': SEASONS,
+        'mode': 'incremental',
+        'engine': 'pandas',
+        'feature_mode': 'python',
+        'db_sync': 'delta',
+        'requests_per_minute': 10,
+        'max_workers': 1,
+        'cache_dir': None,
+        'cache_ttl': 3600,
+        'raw_store_dir': str(tmp_path / 'raw'),
+        'processed_cache_dir': str(tmp_path / 'processed'),
+        'feature_state_path': str(tmp_path / 'feature_state.json'),
+        'database': {}
+    }
+
+def test_failed_full_load_is_retried(config, monkeypatch):
+    loaded = []
+    def load_data(config, df):
+        if not loaded:
+            loaded.append(None)
+            raise RuntimeError("Database load failed")
+        loaded.append(df)
+    monkeypatch.setattr(main, 'load_data', load_data)
+
+    with pytest.raises(RuntimeError):
+        main.run_update(config)
+    assert main.open_raw_store(config).seasons() == []
+
+    assert main.run_update(config) == "Update completed successfully"
+    assert len(loaded[-1]) > 0
+    assert main.open_raw_store(config).seasons() == SEASONS
+
+def test_seasons_are_final_only_once_every_fixture_is_scored(config, monkeypatch, tmp_path):
+    # Past seasons, but the stored pages were scraped before their last matchdays
+    archive = synthesize_pages(SEASONS, str(tmp_path / 'replay'))
+    monkeypatch.setattr(main, 'MatchScraper', lambda seasons, **kwargs: replay_scraper(seasons, archive))
+    loaded = []
+    monkeypatch.setattr(main, 'load_data', lambda config, df: loaded.append(df))
+
+    assert main.run_update(config) == "Update completed successfully"
+    assert main.run_update(config) == "No changed fixtures"
+
+    scraper = replay_scraper(SEASONS, archive)
+    for season in SEASONS:
+        archive.save(scraper.get_url(season), make_schedule_page(season, unplayed=0))
+    assert main.run_update(config).startswith("Incremental update completed")
+    assert main.run_update(config) == "All seasons finalized, nothing to update"
@@ -0,0 +1,50 @@
+from http_fetcher import HttpFetcher
+from page_cache import PageCache
+from replay import PageArchive, ReplayServer
+from conftest import FakeSession, make_response
+
+URL = 'https://fbref.com/en/comps/9/2025-2026/schedule/'
+
+def test_live_copy_is_refetched_before_it_is_kept_for_good(tmp_path):
+    archive = PageArchive(str(tmp_path / 'archive'))
+    cache = PageCache(str(tmp_path / 'cache'))
+    with ReplayServer(archive) as server:
+        url = server.base_url + '2025-2026/schedule/'
+        archive.save(url, 'matchday 37')
+        fetcher = HttpFetcher(cache=cache)
+        assert fetcher.fetch(url) == 'matchday 37'
+
+        archive.save(url, 'matchday 38 (final)')
+        assert fetcher.fetch(url, immutable=True) == 'matchday 38 (final)'
+        assert cache.load(url)['immutable']
+
+        archive.save(url, 'matchday 38 (edited)')
+        assert fetcher.fetch(url, immutable=True) == 'matchday 38 (final)'
+    assert cache.stats['misses'] == 2 and cache.stats['hits'] == 1
+
+def test_live_copy_is_revalidated_once_when_the_season_ends(tmp_path):
+    url = URL
+    cache = PageCache(str(tmp_path / 'cache'))
+    cache.store(url, 'matchday 38', {'ETag': '"v1"'})
+
+    fetcher = HttpFetcher(cache=cache)
+    fetcher.session = FakeSession([make_response(304)])
+    assert fetcher.fetch(url, immutable=True) == 'matchday 38'
+    assert fetcher.session.requests[0]['If-None-Match'] == '"v1"'
+    assert cache.load(url)['immutable']
+
+    # Served from the cache from now on, no request is made
+    assert fetcher.fetch(url, immutable=True) == 'matchday 38'
+    assert len(fetcher.session.requests) == 1
+
+def test_fresh_live_copy_is_served_within_the_ttl(tmp_path):
+    url = URL
+    cache = PageCache(str(tmp_path / 'cache'), ttl=3600)
+    cache.store(url, 'matchday 20', {})
+
+    fetcher = HttpFetcher(cache=cache)
+    fetcher.session = FakeSession([make_response(200, 'matchday 21')])
+    assert fetcher.fetch(url) == 'matchday 20'
+    assert fetcher.session.requests == []
+    assert fetcher.fetch(url, immutable=True) == 'matchday 21'
+    assert cache.load(url)['immutable']
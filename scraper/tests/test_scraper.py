@@ -0,0 +1,106 @@
+import gc
+import weakref
+import numpy as np
+import pandas as pd
+import pytest
+from selenium.common.exceptions import InvalidSelectorException
+from selenium.webdriver.common.by import By
+from http_fetcher import find_table_html
+from parsing import drop_header_rows, parse_scores
+from replay import FakeDriver, ReplayServer, replay_scraper
+from conftest import SEASONS, FakeSession, make_response
+
+def schedule_page(archive, season):
+    scraper = replay_scraper(SEASONS, archive)
+    return scraper, archive.load(scraper.get_url(season))
+
+def test_find_table_html_skips_decoy_tables(archive):
+    scraper, page = schedule_page(archive, 22)
+    table_html = find_table_html(page, scraper.get_table_id(22))
+    assert table_html.startswith(f'<table id="{scraper.get_table_id(22)}"')
+    assert 'decoy_' not in table_html
+    assert find_table_html(page, 'sched_missing') is None
+
+def test_find_table_html_inside_comment(archive):
+    scraper, page = schedule_page(archive, 22)
+    table_id = scraper.get_table_id(22)
+    start = page.index(f'<table id="{table_id}"')
+    end = page.index('</table>', start) + len('</table>')
+    commented = f'{page[:start]}<div class="placeholder"></div><!--\n{page[start:end]}\n-->{page[end:]}'
+
+    table_html = find_table_html(commented, table_id)
+    assert table_html is not None
+    pd.testing.assert_frame_equal(scraper.parse_page(commented, 22), scraper.parse_page(page, 22))
+
+def test_replayed_table_has_no_header_rows(raw_data):
+    # 20 teams play each other home and away; make_schedule_page repeats the header every 10 rows
+    assert len(raw_data) == 2 * 380
+    assert not raw_data['Home'].isin(['Home']).any()
+    assert not raw_data['Wk'].isin(['Wk']).any()
+
+def test_http_and_chrome_paths_agree(archive, raw_data):
+    with ReplayServer(archive) as server:
+        scraper = replay_scraper(SEASONS, archive, server=server)
+        scraped = pd.concat([scraper.scrape_season(season) for season in SEASONS], ignore_index=True)
+    pd.testing.assert_frame_equal(scraped, raw_data)
+
+def test_drop_header_rows():
+    df = pd.DataFrame({'Home': ['Arsenal', 'Home', 'Chelsea'], 'Score': ['1–0', 'Score', '2–2']})
+    assert drop_header_rows(df)['Home'].tolist() == ['Arsenal', 'Chelsea']
+
+def test_parse_scores():
+    # Two-digit scores compare as numbers: "10" must not sort below "9"
+    df = parse_scores(pd.DataFrame({'Score': ['2–1', '0 – 0', '1–3', '10–9', '9–10', np.nan]}))
+    assert df['Status'].tolist() == ['yes'] * 5 + ['no']
+    assert df['H.goals'].tolist()[:5] == [2, 0, 1, 10, 9] and pd.isna(df['H.goals'].iloc[5])
+    assert df['A.goals'].tolist()[:5] == [1, 0, 3, 9, 10] and pd.isna(df['A.goals'].iloc[5])
+    assert df['Result'].tolist()[:5] == [3, 1, 0, 3, 0] and pd.isna(df['Result'].iloc[5])
+
+def test_parsed_scores_of_replayed_pages(raw_data):
+    df = parse_scores(raw_data.copy())
+    played = df['Status'] == 'yes'
+    # make_schedule_page leaves the last 10% of each season unplayed
+    assert played.sum() == 2 * 342
+    assert df.loc[played, ['H.goals', 'A.goals', 'Result']].notna().all().all()
+    assert df.loc[~played, ['H.goals', 'A.goals', 'Result']].isna().all().all()
+    assert set(df.loc[played, 'Result']) <= {0, 1, 3}
+
+def test_parallel_scrape_keeps_a_bounded_number_of_seasons(archive, monkeypatch):
+    seasons = list(range(10, 22))
+    scraper = replay_scraper(seasons, archive, max_workers=3)
+    frames = []
+    def scrape_season(season):
+        df = pd.DataFrame({'season': [season]})
+        frames.append(weakref.ref(df))
+        return df
+    monkeypatch.setattr(scraper, 'scrape_season', scrape_season)
+
+    scraped, peak = [], 0
+    for df in scraper.iter_season_frames():
+        scraped.append(df['season'].iloc[0])
+        del df
+        gc.collect()
+        peak = max(peak, sum(frame() is not None for frame in frames))
+    assert sorted(scraped) == seasons
+    assert peak <= 3
+
+def test_rate_limited_fetch_backs_off_and_skips_chrome(archive, monkeypatch):
+    scraper = replay_scraper(SEASONS, archive)
+    scraper.use_http = True
+    retries = scraper.fetcher.rate_limit_retries
+    scraper.fetcher.session = FakeSession([make_response(429)] * (retries + 1))
+    backoffs, pages = [], []
+    monkeypatch.setattr(scraper.rate_limiter, 'acquire', lambda url: None)
+    monkeypatch.setattr(scraper.rate_limiter, 'backoff', lambda url, retry_after=None: backoffs.append(url))
+    monkeypatch.setattr(scraper.driver_session, 'load_page', lambda url, read: pages.append(url))
+
+    assert scraper.scrape_season(22) is None
+    assert len(backoffs) == retries + 1
+    assert pages == []
+
+def test_fake_driver_rejects_unsupported_locators(archive):
+    driver = FakeDriver(archive)
+    driver.get(replay_scraper(SEASONS, archive).get_url(22))
+    assert len(driver.find_elements(By.TAG_NAME, 'table')) == 10
+    with pytest.raises(InvalidSelectorException):
+        driver.find_elements(By.CSS_SELECTOR, 'table')
@@ -0,0 +1,21 @@
+from processor import DataProcessor
+from validation import validate_frame
+
+def test_new_team_names_are_listed_without_failing(raw_data):
+    df = DataProcessor().process_data(raw_data)
+    known = set(df['Team'].astype(str)) - {'Team 03'}
+
+    report = validate_frame(df, known)
+    assert report.passed
+    assert report.new_teams == ['Team 03']
+    assert 'New teams' in report.summary()
+    assert validate_frame(df, set(df['Team'].astype(str))).new_teams == []
+
+def test_header_text_as_team_name_fails(raw_data):
+    df = DataProcessor().process_data(raw_data)
+    df['Team'] = df['Team'].cat.rename_categories({'Team 03': 'Home'})
+
+    report = validate_frame(df, set())
+    assert not report.passed
+    assert 'Home' not in report.new_teams
+    assert [check['column'] for check in report.failures] == ['Team']
@@ -0,0 +1,148 @@
+import time
+import numpy as np
+import pandas as pd
+from features import REGISTRY
+
+# Matches are upserted on (date_of_match, team_id, opponent_id)
+KEY_COLUMNS = ['Date', 'Team', 'Opponent']
+
+# Header text fbref repeats in its tables; never a real team name
+HEADER_NAMES = {'', 'Home', 'Away', 'Squad', 'Team', 'Opponent'}
+
+# column -> kind ('datetime', 'text', 'int', 'float'), optional range or
+# allowed values, and the fraction of nulls allowed
+COLUMN_RULES = {
+    'Date': {'kind': 'datetime', 'nulls': 0.0},
+    'Team': {'kind': 'text', 'nulls': 0.0},
+    'Opponent': {'kind': 'text', 'nulls': 0.0},
+    'xg': {'kind': 'float', 'range': (0, 10), 'nulls': 0.0},
+    'xga': {'kind': 'float', 'range': (0, 10), 'nulls': 0.0},
+    'goals': {'kind': 'int', 'range': (0, 30), 'nulls': 0.0},
+    'opponent_goals': {'kind': 'int', 'range': (0, 30), 'nulls': 0.0},
+    'Status': {'kind': 'text', 'values': ('yes', 'no'), 'nulls': 0.0},
+    'Result': {'kind': 'int', 'values': (0, 1, 3), 'nulls': 0.0},
+    'location': {'kind': 'text', 'values': ('home', 'away'), 'nulls': 0.0}
+}
+
+REQUIRED_COLUMNS = list(COLUMN_RULES)
+
+KIND_CHECKS = {
+    'datetime': pd.api.types.is_datetime64_any_dtype,
+    'text': lambda dtype: pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+                          or isinstance(dtype, pd.CategoricalDtype),
+    'int': pd.api.types.is_integer_dtype,
+    'float': pd.api.types.is_float_dtype
+}
+
+def feature_rules():
+    """Features are floats; a window mean stays within its source column's range."""
+    rules = {}
+    for feature in REGISTRY.features.values():
+        source_rule = COLUMN_RULES.get(feature.source, {})
+        value_range = source_rule.get('range')
+        if 'values' in source_rule:
+            value_range = (min(source_rule['values']), max(source_rule['values']))
+        rules[feature.name] = {'kind': 'float', 'range': value_range, 'nulls': 1.0}
+    return rules
+
+
+class ValidationReport:
+    """Outcome of every check; failed checks carry the number of bad rows."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.checks = []
+        self.seconds = 0.0
+        # Valid names missing from the known teams, e.g. a promoted side or a
+        # renamed one; reported for review, not failed
+        self.new_teams = []
+
+    def add(self, check, column, failed, detail=''):
+        self.checks.append({'check': check, 'column': column, 'failed': int(failed), 'detail': detail})
+
+    @property
+    def failures(self):
+        return [check for check in self.checks if check['failed']]
+
+    @property
+    def passed(self):
+        return not self.failures
+
+    def __bool__(self):
+        return self.passed
+
+    def to_dict(self):
+        return {'rows': self.rows, 'passed': self.passed, 'seconds': self.seconds, 'checks': self.checks,
+                'new_teams': self.new_teams}
+
+    def summary(self):
+        if self.passed:
+            lines = [f"Validation passed: {self.rows} rows, {len(self.checks)} checks in {self.seconds:.3f}s"]
+        else:
+            lines = [f"Validation failed: {len(self.failures)} of {len(self.checks)} checks on {self.rows} rows"]
+        for check in self.failures:
+            lines.append(f"  {check['check']} [{check['column']}]: {check['failed']} rows {check['detail']}".rstrip())
+        if self.new_teams:
+            lines.append(f"  New teams, not in the database or earlier seasons: {self.new_teams}")
+        return '\n'.join(lines)
+
+
+def check_column(report, name, col, rule):
+    """Dtype, null budget, range and allowed values for one column."""
+    if not KIND_CHECKS[rule['kind']](col.dtype):
+        report.add('dtype', name, len(col), f"is {col.dtype}, expected {rule['kind']}")
+        return
+
+    nulls = col.isna()
+    null_count = nulls.sum()
+    report.add('nulls', name, null_count if null_count > rule['nulls'] * len(col) else 0,
+               f"over the {rule['nulls']:.0%} budget")
+
+    if rule.get('values') is not None:
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            # Check the categories once, then count the rows using bad ones
+            bad_codes = np.flatnonzero(~col.cat.categories.isin(rule['values']))
+            bad = np.isin(col.cat.codes.to_numpy(), bad_codes).sum()
+        else:
+            bad = (~col.isin(rule['values']) & ~nulls).sum()
+        report.add('values', name, bad, f"not in {rule['values']}")
+
+    if rule.get('range') is not None:
+        low, high = rule['range']
+        values = col.to_numpy(dtype='float64', na_value=np.nan)
+        bad = (~np.isnan(values) & ((values < low) | (values > high) | ~np.isfinite(values))).sum()
+        report.add('range', name, bad, f"outside [{low}, {high}]")
+
+def validate_frame(df, known_teams=None):
+    """
+    Runs every check on a processed team frame and returns a
+    ValidationReport; nothing is raised here. Names outside known_teams
+    are listed in report.new_teams.
+    """
+    start = time.perf_counter()
+    report = ValidationReport(len(df))
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    report.add('required', ', '.join(missing) or 'all', len(df) if missing else 0, 'missing columns')
+
+    rules = dict(COLUMN_RULES)
+    rules.update(feature_rules())
+    for name, rule in rules.items():
+        if name in df.columns:
+            check_column(report, name, df[name], rule)
+
+    if not missing:
+        duplicated = df.duplicated(KEY_COLUMNS, keep=False).sum()
+        report.add('unique', ', '.join(KEY_COLUMNS), duplicated, 'share a key')
+
+        for col in ('Team', 'Opponent'):
+            names = pd.Series(pd.unique(df[col].astype(object).to_numpy()))
+            is_invalid = names.isna() | names.astype(str).str.strip().isin(HEADER_NAMES)
+            invalid = names[is_invalid]
+            bad = df[col].isin(invalid).sum()
+            report.add('teams', col, bad, f"invalid names {sorted(map(str, invalid))[:5]}" if bad else '')
+            if known_teams is not None:
+                new_teams = names[~is_invalid & ~names.isin(list(known_teams))]
+                report.new_teams = sorted(set(report.new_teams) | set(map(str, new_teams)))
+
+    report.seconds = time.perf_counter() - start
+    return report